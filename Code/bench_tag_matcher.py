@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# bench_tag_matcher.py
+# Ziel: Vergleich TagMatcher (Aho-Corasick) gegen die bisherigen linearen `tag in task.lower()`-Schleifen
+
+import random, sys, timeit
+
+from rpg_tag_matcher import TagMatcher
+
+CATEGORIES = ["Allgemein", "Finanziell", "Intellektuell", "Spirituell", "Physisch", "Sozial", "Sprachlich"]
+
+
+def build_rules(n_tags, seed=1):
+    rng = random.Random(seed)
+    rules, goal_rules = {}, {}
+    for i in range(n_tags):
+        tag = f"#tag{i:04d}"
+        mode = "Ziel" if i % 25 == 0 else "Zeit"
+        rules[tag] = {"category": rng.choice(CATEGORIES), "base_xp": rng.choice([0.5, 1.0, 2.0, 3.0]), "mode": mode, "metric": "-"}
+        if mode == "Ziel":
+            goal_rules[tag] = {"name": f"Ziel{i}", "target": 10.0, "end_date": None}
+    return rules, goal_rules
+
+
+def build_tasks(rules, n_tasks, seed=2):
+    rng = random.Random(seed)
+    tags = list(rules)
+    tasks = []
+    for i in range(n_tasks):
+        picked = " ".join(rng.sample(tags, rng.choice([0, 1, 1, 2])))
+        tasks.append(f"Aufgabe Nummer {i} mit etwas Beschreibungstext (45m) {picked}")
+    return tasks
+
+
+def legacy_loops(task, rules, goal_rules):
+    """ Die vier Durchläufe aus scan_vault vor dem TagMatcher. """
+    cat = "Allgemein"
+    for tag, rule in rules.items():
+        if tag in task.lower():
+            cat = rule["category"]
+            break
+    matched_rule = None
+    for tag, rule in rules.items():
+        if tag in task.lower():
+            matched_rule = rule
+            break
+    base_xp = None
+    for tag, rule in rules.items():
+        if tag in task.lower():
+            base_xp = rule["base_xp"]
+            break
+    goals = [tag for tag in goal_rules if tag in task.lower()]
+    return cat, matched_rule, base_xp, goals
+
+
+def matcher_pass(task, matcher, goal_rules):
+    matches = matcher.match(task)
+    matched_rule = matches[0][1] if matches else None
+    cat = matched_rule["category"] if matched_rule else "Allgemein"
+    base_xp = matched_rule["base_xp"] if matched_rule else None
+    goals = [tag for tag, _ in matches if tag in goal_rules]
+    return cat, matched_rule, base_xp, goals
+
+
+def run(n_tags, n_tasks=2000, repeat=5):
+    rules, goal_rules = build_rules(n_tags)
+    tasks = build_tasks(rules, n_tasks)
+    matcher = TagMatcher(rules)
+    for t in tasks:
+        assert legacy_loops(t, rules, goal_rules) == matcher_pass(t, matcher, goal_rules), t
+
+    legacy = min(timeit.repeat(lambda: [legacy_loops(t, rules, goal_rules) for t in tasks], number=1, repeat=repeat))
+    fast = min(timeit.repeat(lambda: [matcher_pass(t, matcher, goal_rules) for t in tasks], number=1, repeat=repeat))
+    print(f"{n_tags:>5} Tags | {n_tasks} Tasks | Schleifen: {legacy * 1000:8.2f} ms | TagMatcher: {fast * 1000:7.2f} ms | x{legacy / fast:5.1f}")
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [25, 100, 300, 1000]
+    for n in sizes:
+        run(n)
@@ -1,12 +1,37 @@
 #!/usr/bin/env python3
 # obsidian_rpg_sync_v5.py
 
-import os, json, datetime, re, sys
+import os, json, datetime, re, sys, time, argparse, sqlite3
+from contextlib import contextmanager, redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+
+from rpg_manifest import (load_manifest, save_manifest, manifest_payload, check_entry, make_entry, content_hash,
+                          rules_fingerprint)
+from rpg_tag_matcher import TagMatcher
+from rpg_task_lexer import lex_journal, lex_task, OPEN_TASK_RE
+from rpg_xp_kernel import score_xp
+from rpg_task_index import sync_task_index, open_index, completed_on, INDEX_PATH, TODO_LIST_PATH
+from rpg_rollups import update_rollups
+from rpg_prefix import update_prefix, load_prefix, is_current_prefix, totals_as_of, range_delta
+from rpg_records import metric_fields, reduce_records
+from rpg_running import run_analytics
+from rpg_streaks import update_streaks, streak_stats
+from rpg_goals import update_goal_index, apply_goal_forecast
+from rpg_people import update_people, people_stats
+from rpg_mood import update_mood, mood_stats
+from rpg_seal import load_seals, save_seals, month_closed, month_of, month_fingerprint
+from rpg_walker import walk_vault
+from rpg_output import load_output_state, save_output_state, write_output
+from rpg_shards import write_shards, summary_shard
+from rpg_profile import stage_counters, bump, profile_sync, SLOWEST_FILES
 
 # --- KONSTANTEN & PFADE ---
 RULES_PATH = '01_Core/XP_Calculation.md'
-TODO_LIST_PATH = '01_Core/todo_list.md'
 JSON_CACHE_PATH = '08_System/life_rpg_data_v5.json' 
+RULES_CACHE_PATH = '08_System/rpg_rules_cache_v5.json'
+RULES_CACHE_VERSION = 2
+PARTIAL_VERSION = 6  # Form der Teil-Aggregate; Teil des rules_key, eine Änderung bewertet aus den Task-Spalten neu
+_RULES_MEMO = {}  # rules_file -> (fingerprint, snapshot), prozessweiter Cache
 HTML_DASHBOARD_PATH = 'rpg_dashboard_v5.html'
 START_MARKER = '// <START_JSON_INJECTION>'
 END_MARKER = '// <END_JSON_INJECTION>'
@@ -14,13 +39,17 @@ JSON_INDENT_SPACES = 4
 JOURNAL_DIR_NAME = '07_Journal'
 BASE_XP_UNIT_MINUTES = 30 
 XP_POINTS_MAPPING = {"1p": 1.0, "3p": 3.0, "5p": 5.0, "8p": 8.0}
+PARALLEL_MIN_FILES = 200  # darunter lohnt der Prozessstart für --jobs nicht
+PASSIVE_THOUGHT_XP = {"Deep_Thoughts": 15.0, "Insights": 10.0, "Daily": 1.0}  # je Notiz (Tabelle aus calculate_xp_v4)
 
 # --- 1. REGELN LADEN ---
-def load_rpg_rules(vault_path):
-    rules_file = os.path.join(vault_path, RULES_PATH)
+def load_rpg_rules(vault_path, rules_file=None):
+    # rules_file: alternative Regeltabelle im selben Format (z.B. für den What-if-Simulator)
+    rules_file = rules_file or os.path.join(vault_path, RULES_PATH)
     rules = {}
     goal_rules = {}
-    categories = set(["Allgemein", "Finanziell", "Intellektuell", "Spirituell", "Physisch", "Sozial", "Sprachlich"])
+    # dict statt set: stabile Reihenfolge, damit die Ausgabe zwischen Läufen identisch bleibt
+    categories = dict.fromkeys(["Allgemein", "Finanziell", "Intellektuell", "Spirituell", "Physisch", "Sozial", "Sprachlich"])
     if os.path.exists(rules_file):
         with open(rules_file, "r", encoding="utf-8") as f:
             for line in f:
@@ -38,7 +67,7 @@ def load_rpg_rules(vault_path):
                             "mode": mode,
                             "metric": metric
                         }
-                        categories.add(cat)
+                        categories.setdefault(cat)
                         if len(parts) >= 5 and parts[3].lower() == "ziel":
                             goal_spec = parts[4]
                             if goal_spec.startswith("@") and "," in goal_spec:
@@ -62,6 +91,76 @@ def load_rpg_rules(vault_path):
                                     }
     return rules, list(categories), goal_rules
 
+def load_rules_snapshot(vault_path, counters=None):
+    """
+    Liefert (tag_rules, categories, goal_rules, tag_matcher, rules_key) aus dem Regel-Cache in 08_System.
+    Der Cache ist an mtime/Größe bzw. den Inhalts-Hash von XP_Calculation.md gebunden und wird
+    bei jeder Änderung der Tabelle automatisch neu aufgebaut. `counters` (rpg_profile) zählt Treffer/Neuaufbau.
+    """
+    rules_file = os.path.join(vault_path, RULES_PATH)
+    cache_file = os.path.join(vault_path, RULES_CACHE_PATH)
+    try:
+        st = os.stat(rules_file)
+        fingerprint = {"mtime": st.st_mtime_ns, "size": st.st_size}
+    except OSError:
+        st, fingerprint = None, {"mtime": None, "size": None}
+
+    # Im selben Prozess (Watch-Modus, Server) reicht ein stat
+    memo = _RULES_MEMO.get(rules_file)
+    if memo and memo[0] == fingerprint:
+        bump(counters, cache_hits=1)
+        return memo[1]
+
+    cached = None
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (IOError, ValueError):
+            cached = None
+    if cached and (cached.get("version") != RULES_CACHE_VERSION or cached.get("partial_version") != PARTIAL_VERSION):
+        # rules_key im Cache enthält PARTIAL_VERSION
+        cached = None
+
+    digest = None
+    if cached and cached["fingerprint"] != fingerprint and st is not None:
+        # mtime geändert: nur neu parsen, wenn sich auch der Inhalt geändert hat
+        with open(rules_file, "rb") as f:
+            digest = content_hash(f.read())
+        if digest != cached.get("sha1"):
+            cached = None
+    if cached and (cached["fingerprint"] == fingerprint or digest is not None):
+        tag_rules, goal_rules = cached["tag_rules"], cached["goal_rules"]
+        tag_matcher = TagMatcher.from_state(cached["matcher"], tag_rules)
+        if digest is not None:
+            cached["fingerprint"] = fingerprint
+            _write_rules_cache(cache_file, cached)
+        snapshot = (tag_rules, cached["categories"], goal_rules, tag_matcher, cached["rules_key"])
+        _RULES_MEMO[rules_file] = (fingerprint, snapshot)
+        bump(counters, cache_hits=1)
+        return snapshot
+
+    tag_rules, categories, goal_rules = load_rpg_rules(vault_path)
+    rules_key = rules_fingerprint(tag_rules, goal_rules, BASE_XP_UNIT_MINUTES, XP_POINTS_MAPPING, PARTIAL_VERSION)
+    tag_matcher = TagMatcher(tag_rules)
+    if digest is None and st is not None:
+        with open(rules_file, "rb") as f:
+            digest = content_hash(f.read())
+    _write_rules_cache(cache_file, {
+        "version": RULES_CACHE_VERSION, "partial_version": PARTIAL_VERSION, "fingerprint": fingerprint, "sha1": digest,
+        "tag_rules": tag_rules, "categories": categories, "goal_rules": goal_rules,
+        "matcher": tag_matcher.to_state(), "rules_key": rules_key
+    })
+    snapshot = (tag_rules, categories, goal_rules, tag_matcher, rules_key)
+    _RULES_MEMO[rules_file] = (fingerprint, snapshot)
+    bump(counters, cache_misses=1, files_read=1 if st else 0, bytes_read=st.st_size if st else 0)
+    return snapshot
+
+def _write_rules_cache(cache_file, data):
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    with open(cache_file, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
 # --- 2. PARSE-FUNKTIONEN (Robust) ---
 def parse_duration(task_text):
     match_std = re.search(r'\((?:(?P<h>\d+)\s*h)?\s*(?P<m>\d+)\s*m(?:in)?\)', task_text, re.IGNORECASE)
@@ -84,46 +183,135 @@ def parse_sallyup_time(task_text):
         return int(match.group('m')) + (int(match.group('s')) / 60.0)
     return 0.0
 
-def parse_goal_reference(task_text, tag):
-    goal_match = re.search(rf'{re.escape(tag)}@([^#]+?)(?=\s#|$)', task_text, re.IGNORECASE)
-    if not goal_match:
-        return None, None
-    raw_name = goal_match.group(1).strip()
-    count_match = re.search(r'^(?P<name>.*?)[\(\[](?P<count>\d+)[\)\]]$', raw_name)
-    if count_match:
-        return count_match.group('name').strip(), int(count_match.group('count'))
-    count_match = re.search(r'^(?P<name>.*?)[,;]\s*(?P<count>\d+)$', raw_name)
-    if count_match:
-        return count_match.group('name').strip(), int(count_match.group('count'))
-    return raw_name, None
-
-def get_task_category(task_text, tag_rules):
-    for tag, rule in tag_rules.items():
-        if tag in task_text.lower():
-            return rule["category"]
-    return "Allgemein"
-
-# --- 3. KERN-SCAN (Full Scan Modus) ---
-def scan_vault(vault_path):
-    TAG_RULES, SKILL_CATEGORIES, GOAL_RULES = load_rpg_rules(vault_path)
-    
-    # Variablen fÃ¼r den Full-Scan (Reset bei jedem Start)
-    total_xp = 0.0
-    skill_xp = {cat: 0.0 for cat in SKILL_CATEGORIES}
-    run_total_km = 0.0
-    run_total_min = 0.0
-    sallyup_best_min = 0.0
-    goal_progress = {}
-    
-    stats = {
-        "open_tasks": {cat: [] for cat in SKILL_CATEGORIES},
-        "latest_daily_stats": {
-            "total_xp_today": 0.0, "tasks_today": 0, 
-            "minutes_today": 0.0, "daily_breakdown": {cat: 0.0 for cat in SKILL_CATEGORIES}
-        },
-        "latest_date": None
+def parse_goal_reference(task_text, tag=None):
+    """
+    (Zielname, Anzahl) der ersten Ziel-Referenz oder (None, None). Delegiert an den Lexer, damit
+    "@Name(3)", "#Tag@Name[3]" und "#Tag@Name, 3" überall gleich gelesen werden; `tag` bleibt nur für Aufrufer aus v4.
+    """
+    refs = lex_task(task_text, None).goal_refs
+    return refs[0] if refs else (None, None)
+
+def get_task_category(task_text, tag_matcher):
+    rule = tag_matcher.first(task_text)
+    return rule["category"] if rule else "Allgemein"
+
+# --- 3. DATEI-PARSER (ein Journal -> regelunabhängige Task-Spalten) ---
+def lex_journal_columns(content, d_str):
+    """
+    Zerlegt eine Journal-Datei in Spalten (eine Liste pro Feld). Die Spalten hängen nicht von
+    XP_Calculation.md ab (tag_ids ergänzt erst score_files) und werden im Manifest als Task-Store gehalten.
+    """
+    records = lex_journal(content, d_str)
+    return {
+        "text": [r.text for r in records],
+        "points": [r.points for r in records],
+        "minutes": [r.minutes for r in records],
+        "km": [r.km for r in records],
+        "time": [r.time_value for r in records],
+        "goal": [list(r.goal_refs[0]) if r.goal_refs else None for r in records],
+        "links": [list(r.links) for r in records]
     }
 
+# --- 3b. BEWERTUNG (Task-Spalten + Regeln -> Teil-Aggregat je Datei) ---
+def score_tasks(columns_list, tag_matcher, reuse_tag_ids=False):
+    """
+    XP je Aufgabe für die Task-Spalten mehrerer Dateien (ein Kernel-Aufruf).
+    Liefert flache Listen (tag_ids, xp_values, minutes) in Dateireihenfolge.
+    Die Spalte "tag_ids" wird ergänzt; mit reuse_tag_ids (Tag-Liste unverändert) wird sie übernommen.
+    """
+    tag_ids, points_xp, minutes, rule_idx = [], [], [], []
+    for cols in columns_list:
+        if not reuse_tag_ids or "tag_ids" not in cols:
+            cols["tag_ids"] = [tag_matcher.match_indices(text) for text in cols["text"]]
+        for ids, points, mins in zip(cols["tag_ids"], cols["points"], cols["minutes"]):
+            tag_ids.append(ids)
+            points_xp.append(XP_POINTS_MAPPING.get(f"{points}p", 0.0) if points is not None else 0.0)
+            minutes.append(mins)
+            # Der erste Tag-Treffer hat Priorität (Tabellen-Reihenfolge)
+            rule_idx.append(ids[0] if ids else -1)
+
+    xp_values = score_xp(
+        points_xp, minutes, rule_idx,
+        [r["base_xp"] for r in tag_matcher.rules],
+        [r.get("mode") == "Ziel" for r in tag_matcher.rules],
+        BASE_XP_UNIT_MINUTES
+    )
+    return tag_ids, xp_values, minutes
+
+def score_files(columns_list, tag_matcher, goal_rules, reuse_tag_ids=False):
+    """
+    Bewertet die Task-Spalten mehrerer Dateien und liefert je Datei ein Teil-Aggregat,
+    das unabhängig von anderen Dateien ist.
+    """
+    tag_ids, xp_values, minutes = score_tasks(columns_list, tag_matcher, reuse_tag_ids)
+    fields = metric_fields(tag_matcher)
+
+    partials = []
+    k = 0
+    for cols in columns_list:
+        partial = {
+            "xp": 0.0, "skill_xp": {}, "tasks": 0, "minutes": 0.0,
+            "run_km": 0.0, "run_min": 0.0, "sallyup_best": 0.0,
+            "goals": [], "completed": [], "metrics": {}, "runs": [], "links": {}
+        }
+        goal_index = {}
+        file_tag_ids = set()
+        for task, km, time_value, goal_ref, links in zip(cols["text"], cols["km"], cols["time"], cols["goal"], cols["links"]):
+            ids, xp_val, dur = tag_ids[k], xp_values[k], minutes[k]
+            k += 1
+            task_lower = task.lower()
+            cat = tag_matcher.rules[ids[0]]["category"] if ids else "Allgemein"
+
+            partial["xp"] += xp_val
+            partial["skill_xp"][cat] = partial["skill_xp"].get(cat, 0.0) + xp_val
+            partial["tasks"] += 1
+            partial["minutes"] += dur
+            partial["completed"].append(task)
+            # [[Links]] je Aufgabe (Personen werden erst gegen 02_People gefiltert)
+            for name in links:
+                partial["links"][name] = partial["links"].get(name, 0) + 1
+
+            if "#run" in task_lower:
+                partial["run_km"] += km
+                partial["run_min"] += dur
+                if km or dur:
+                    partial["runs"].append([km, dur])
+
+            if "#sallyup" in task_lower:
+                if time_value > partial["sallyup_best"]:
+                    partial["sallyup_best"] = time_value
+
+            file_tag_ids.update(ids)
+            for tag_id in ids:
+                tag = tag_matcher.tags[tag_id]
+                field = fields[tag_id]
+                if field:
+                    # Metrik-Tags (Regeltabelle): Wert aus der passenden Task-Spalte, 0 = nicht angegeben
+                    value = km if field == "km" else time_value if field == "time" else dur
+                    if value:
+                        partial["metrics"].setdefault(tag, []).append(value)
+                goal = goal_rules.get(tag)
+                if goal:
+                    if goal_ref:
+                        goal_name, count = goal_ref
+                    else:
+                        count = 1.0
+                        goal_name = goal["name"]
+                    # [Zielname, Regel-Tag (für Zielwert/Enddatum), Summe]
+                    if goal_name not in goal_index:
+                        goal_index[goal_name] = len(partial["goals"])
+                        partial["goals"].append([goal_name, tag, 0.0])
+                    partial["goals"][goal_index[goal_name]][2] += count
+        # Tags der Datei in Tabellen-Reihenfolge (für die Streak-Bitsets)
+        partial["tags"] = [tag_matcher.tags[i] for i in sorted(file_tag_ids)]
+        partials.append(partial)
+    return partials
+
+def parse_journal_file(content, d_str, tag_matcher, goal_rules):
+    """ Parst und bewertet eine einzelne Journal-Datei. """
+    return score_files([lex_journal_columns(content, d_str)], tag_matcher, goal_rules)[0]
+
+def list_journal_files(vault_path):
     journal_dir = os.path.join(vault_path, JOURNAL_DIR_NAME)
     all_files = []
     for root, _, filenames in os.walk(journal_dir):
@@ -131,166 +319,639 @@ def scan_vault(vault_path):
             if f.endswith(".md") and re.match(r'\d{4}-\d{2}-\d{2}', f):
                 all_files.append((f[:-3], os.path.join(root, f)))
     all_files.sort()
+    return all_files
+
+def plan_vault_scan(vault_path, seals, touched_months=(), full=False, report=None):
+    """
+    Ein Durchlauf über den Vault (rpg_walker) für alle Subsysteme. Versiegelte Monatsordner mit unverändertem
+    Fingerprint (rpg_seal.month_fingerprint: Namen, mtimes und Größen der Dateien) werden nicht weiter betreten;
+    Monate in `touched_months` (z.B. vom Watch-Modus gemeldet) immer. Gibt (walked, all_files, stats, reused,
+    fingerprints) zurück: die Dateien je Subsystem, die zu prüfenden Journale, deren stat-Ergebnisse, die
+    weiterverwendeten Siegel und die Fingerprints der betretenen abgeschlossenen Monate.
+    """
+    reused, fingerprints = {}, {}
+
+    def prune_sealed(route, rel_dir, mtime):
+        month = month_of(rel_dir + "/", JOURNAL_DIR_NAME) if route == "journal" else None
+        if month is None or rel_dir.count("/") != 1 or not month_closed(month):
+            return False
+        # Vor dem Lesen der Dateien: eine spätere Änderung bricht das Siegel beim nächsten Lauf
+        fingerprint = month_fingerprint(os.path.join(vault_path, *rel_dir.split("/")))
+        seal = seals.get(month)
+        if seal and fingerprint is not None and seal["fingerprint"] == fingerprint and month not in touched_months:
+            reused[month] = seal
+            return True
+        if fingerprint is not None:
+            fingerprints[month] = fingerprint
+        return False
+
+    walked = walk_vault(vault_path, prune_sealed, full, report)
+    all_files, stats = [], {}
+    for _, f_path, st in walked["journal"]:
+        name = os.path.basename(f_path)
+        if re.match(r'\d{4}-\d{2}-\d{2}', name):
+            all_files.append((name[:-3], f_path))
+            stats[f_path] = st
+    all_files.sort()
+    return walked, all_files, stats, reused, fingerprints
+
+def apply_seals(vault_path, all_files, partials, new_entries, reused, fingerprints):
+    """
+    Führt versiegelte und frisch geprüfte Teil-Aggregate in Dateireihenfolge zusammen und versiegelt
+    abgeschlossene Monate. Gibt (partials, seals, manifest_entries) zurück; versiegelte Dateien
+    verlassen das Manifest, damit dessen Größe nur mit den offenen Monaten wächst.
+    """
+    prefix_len = len(os.path.join(vault_path, ""))
+    seals = dict(reused)
+    items = [(d_str, rel, entry["partial"]) for seal in reused.values() for d_str, rel, entry in seal["files"]]
+    fresh = {}
+    for (d_str, f_path), (_, part) in zip(all_files, partials):
+        rel = f_path[prefix_len:].replace(os.sep, "/")
+        items.append((d_str, rel, part))
+        month = month_of(rel, JOURNAL_DIR_NAME)
+        if month in fingerprints:
+            fresh.setdefault(month, []).append([d_str, rel, new_entries[rel]])
+    for month, files in fresh.items():
+        seals[month] = {"fingerprint": fingerprints[month], "files": files}
+    items.sort(key=lambda item: (item[0], item[1]))
+    manifest_entries = {rel: e for rel, e in new_entries.items() if month_of(rel, JOURNAL_DIR_NAME) not in fresh}
+    return [(d_str, part) for d_str, _, part in items], seals, manifest_entries
+
+def rescore_seals(reused, tag_matcher, goal_rules, reuse_tag_ids=False):
+    """
+    Bewertet die Task-Spalten weiterverwendeter Siegel nach geänderten Regeln neu (ein Kernel-Aufruf, kein Markdown).
+    Gibt (neue Siegel, neu bewertete relative Pfade) zurück.
+    """
+    files = [(month, d_str, rel, entry) for month, seal in reused.items() for d_str, rel, entry in seal["files"]]
+    scored = score_files([entry["tasks"] for _, _, _, entry in files], tag_matcher, goal_rules, reuse_tag_ids)
+    seals = {month: {"fingerprint": seal["fingerprint"], "files": []} for month, seal in reused.items()}
+    for (month, d_str, rel, entry), partial in zip(files, scored):
+        seals[month]["files"].append([d_str, rel, dict(entry, partial=partial)])
+    return seals, [rel for _, _, rel, _ in files]
+
+def _read_and_lex(f_path, d_str, known_sha1):
+    """ Liest, hasht und zerlegt eine Datei. Bei unverändertem Hash (nur "angefasst") wird nicht geparst. """
+    with open(f_path, "rb") as f:
+        raw = f.read()
+    digest = content_hash(raw)
+    if digest == known_sha1:
+        return digest, None
+    return digest, lex_journal_columns(raw.decode("utf-8"), d_str)
+
+def _parse_chunk(chunk, tag_matcher, goal_rules):
+    # Worker-Funktion für den ProcessPoolExecutor (muss auf Modulebene liegen).
+    # Die Zeit je Datei (Lesen + Zerlegen) reist mit dem Ergebnis zurück, auch aus Worker-Prozessen.
+    lexed, seconds = [], []
+    for f_path, d_str, known_sha1 in chunk:
+        started = time.perf_counter()
+        lexed.append(_read_and_lex(f_path, d_str, known_sha1))
+        seconds.append(time.perf_counter() - started)
+    fresh = [cols for _, cols in lexed if cols is not None]
+    scored = iter(score_files(fresh, tag_matcher, goal_rules))
+    return [(digest, cols, next(scored) if cols is not None else None, secs)
+            for (digest, cols), secs in zip(lexed, seconds)]
+
+def parse_pending(pending, tag_matcher, goal_rules, jobs=1):
+    """
+    Map-Schritt: liest, zerlegt und bewertet die Dateien aus `pending` ((f_path, d_str, known_sha1), sortiert).
+    Ab PARALLEL_MIN_FILES Dateien und jobs > 1 in Blöcken über einen ProcessPoolExecutor,
+    sonst seriell. Liefert je Datei (digest, spalten, teil_aggregat, sekunden); spalten/teil_aggregat sind None
+    bei unverändertem Inhalt. Die Ergebnisreihenfolge entspricht immer der Eingabe.
+    """
+    if jobs <= 1 or len(pending) < PARALLEL_MIN_FILES:
+        return _parse_chunk(pending, tag_matcher, goal_rules)
+    chunk_size = max(1, -(-len(pending) // (jobs * 4)))
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for chunk_result in executor.map(_parse_chunk, chunks, [tag_matcher] * len(chunks), [goal_rules] * len(chunks)):
+            results.extend(chunk_result)
+    return results
+
+def collect_partials(vault_path, all_files, tag_matcher, goal_rules, entries, rules_match=True, tags_match=True, jobs=1, report=None, stats=None):
+    """
+    Liefert (partials, new_entries, changed): die Teil-Aggregate aller Journale in Dateireihenfolge,
+    die neuen Manifest-Einträge und die Menge der geänderten relativen Pfade. `stats` ({pfad: stat_result})
+    stammt aus dem Vault-Durchlauf; fehlende Einträge werden per stat nachgeholt.
+    Nur neue oder geänderte Dateien werden gelesen und geparst. Haben sich nur die Regeln geändert,
+    werden die gespeicherten Task-Spalten neu bewertet, ohne Markdown anzufassen.
+    Zähler landen in report["counters"]["journal"]; enthält `report` "file_times" (--profile), kommt je
+    gelesener Datei (rel_pfad, sekunden, bytes) hinzu.
+    """
+    new_entries = {}
+    pending = []
+    rescore = []
+    file_keys = []
+    prefix_len = len(os.path.join(vault_path, ""))
+    for d_str, f_path in all_files:
+        rel_path = f_path[prefix_len:].replace(os.sep, "/")
+        entry, st = check_entry(entries, rel_path, f_path, stats.get(f_path) if stats else None)
+        if entry is None:
+            pending.append((rel_path, d_str, f_path, st, entries.get(rel_path)))
+        elif not rules_match:
+            rescore.append(rel_path)
+        new_entries[rel_path] = entry
+        file_keys.append((d_str, rel_path))
+
+    work = [(f_path, d_str, old["sha1"] if old else None) for _, d_str, f_path, _, old in pending]
+    parsed = tasks_parsed = 0
+    file_times = report.get("file_times") if report is not None else None
+    for (rel_path, _, _, st, old), (digest, columns, partial, secs) in zip(pending, parse_pending(work, tag_matcher, goal_rules, jobs)):
+        if columns is None:
+            # Inhalt unverändert: Spalten übernehmen, Bewertung nur bei geänderten Regeln erneuern
+            columns = old["tasks"]
+            partial = old["partial"]
+            if not rules_match:
+                rescore.append(rel_path)
+        else:
+            parsed += 1
+            tasks_parsed += len(columns["text"])
+        new_entries[rel_path] = make_entry(st, digest, columns, partial)
+        if file_times is not None:
+            file_times.append((rel_path, secs, st.st_size))
+
+    if rescore:
+        # Regeln geändert: alle betroffenen Dateien in einem Kernel-Aufruf neu bewerten
+        rescored = score_files([new_entries[p]["tasks"] for p in rescore], tag_matcher, goal_rules, tags_match)
+        for rel_path, partial in zip(rescore, rescored):
+            new_entries[rel_path] = dict(new_entries[rel_path], partial=partial)
 
-    if all_files:
-        stats["latest_date"] = all_files[-1][0]
-        
-        for d_str, f_path in all_files:
-            is_latest = (d_str == stats["latest_date"])
+    partials = [(d_str, new_entries[rel_path]["partial"]) for d_str, rel_path in file_keys]
+    removed = set(entries) - set(new_entries)
+    if report is not None:
+        report.update(files=len(all_files), parsed=parsed, rescored=len(rescore), removed=len(removed))
+        # Regex-Durchläufe des Lexers: ein findall je Datei, ein finditer je Aufgabe (rpg_task_lexer)
+        bump(stage_counters(report, "journal"), files_read=len(pending), bytes_read=sum(p[3].st_size for p in pending),
+             tasks_parsed=tasks_parsed, regex_calls=parsed + tasks_parsed,
+             cache_hits=len(all_files) - len(pending), cache_misses=len(pending), rescored=len(rescore))
+    # Geänderte Pfade (auch entfernte); leer = Manifest unverändert
+    changed = {p[0] for p in pending} | set(rescore) | removed
+    return partials, new_entries, changed
+
+def load_task_store(vault_path):
+    """
+    Liefert [(datum, task_spalten), ...] für alle Journale in Dateireihenfolge.
+    Unveränderte Dateien kommen aus dem Manifest bzw. den Siegeln, nur neue/geänderte werden gelesen
+    (ohne Manifest oder Siegel zu schreiben).
+    """
+    entries, _, _ = load_manifest(vault_path, None, None)
+    seals, _, _ = load_seals(vault_path, None, None)
+    for seal in seals.values():
+        for _, rel, entry in seal["files"]:
+            entries.setdefault(rel, entry)
+    prefix_len = len(os.path.join(vault_path, ""))
+    store = []
+    for d_str, f_path in list_journal_files(vault_path):
+        entry, _ = check_entry(entries, f_path[prefix_len:].replace(os.sep, "/"), f_path)
+        if entry is not None:
+            store.append((d_str, entry["tasks"]))
+        else:
             with open(f_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            
-            # Abgeschlossene Tasks einlesen
-            completed_tasks = re.findall(r'^\s*- \[x\]\s*(.*)', content, re.MULTILINE)
-            
-            for task in completed_tasks:
-                xp_match = re.search(r'\((?P<p>\d+)p\)', task)
-                xp_val = XP_POINTS_MAPPING.get(f"{xp_match.group('p')}p", 0.0) if xp_match else 0.0
-                dur = parse_duration(task)
-                cat = get_task_category(task, TAG_RULES)
-                matched_rule = None
-                for tag, rule in TAG_RULES.items():
-                    if tag in task.lower():
-                        matched_rule = rule
-                        break
-
-                # Zeitbasierte XP
-                if xp_val == 0.0 and dur > 0:
-                    for tag, rule in TAG_RULES.items():
-                        if tag in task.lower():
-                            xp_val = (dur / BASE_XP_UNIT_MINUTES) * rule["base_xp"]
-                            break
-                if xp_val == 0.0 and matched_rule and matched_rule.get("mode") == "Ziel":
-                    xp_val = matched_rule["base_xp"]
-
-                # Kumulative Metriken
-                total_xp += xp_val
-                if cat in skill_xp: skill_xp[cat] += xp_val
-                
-                if "#run" in task.lower():
-                    run_total_km += parse_kilometers(task)
-                    run_total_min += dur
-                
-                
-                if "#sallyup" in task.lower():
-                    s_time = parse_sallyup_time(task)
-                    if s_time:
-                        if s_time > sallyup_best_min:
-                            sallyup_best_min = s_time
-                            print(f"[DEBUG] Neuer All-Time Rekord gefunden: {s_time} Min")
-
-                for tag, goal in GOAL_RULES.items():
-                    if tag in task.lower():
-                        match = re.search(r'@(?P<name>[\w\-]+)\((?P<count>\d+(?:\.\d+)?)\)', task, re.IGNORECASE)
-                        if match:
-                            count = float(match.group('count'))
-                            goal_name = match.group('name')
-                        else:
-                            count = 1.0
-                            goal_name = goal["name"]
-                        if goal_name not in goal_progress:
-                            goal_progress[goal_name] = {
-                                "title": goal_name,
-                                "current": 0.0,
-                                "target": goal["target"],
-                                "unit": "Lektionen",
-                                "end_date": goal.get("end_date")
-                            }
-                        goal_progress[goal_name]["current"] += count
-                
-                # Heutige Statistik
-                if is_latest:
-                    stats["latest_daily_stats"]["tasks_today"] += 1
-                    stats["latest_daily_stats"]["total_xp_today"] += xp_val
-                    stats["latest_daily_stats"]["minutes_today"] += dur
-                    stats["latest_daily_stats"]["daily_breakdown"][cat] += xp_val
-                    stats["latest_daily_stats"].setdefault("completed_today", []).append(task)
-
-    # ToDo-Liste (Offene Quests)
+                store.append((d_str, lex_journal_columns(f.read(), d_str)))
+    return store
+
+# --- 4. AGGREGATION (Teil-Aggregate -> Gesamtwerte) ---
+def reduce_partials(partials, skill_categories, goal_rules):
+    """ Faltet die Teil-Aggregate in Dateireihenfolge zusammen (deterministisch, unabhängig vom Scan-Modus). """
+    total_xp = 0.0
+    skill_xp = {cat: 0.0 for cat in skill_categories}
+    run_total_km = 0.0
+    run_total_min = 0.0
+    sallyup_best_min = 0.0
+    goal_progress = {}
+
+    latest_date = partials[-1][0] if partials else None
+    latest_daily_stats = {
+        "total_xp_today": 0.0, "tasks_today": 0,
+        "minutes_today": 0.0, "daily_breakdown": {cat: 0.0 for cat in skill_categories}
+    }
+
+    for d_str, part in partials:
+        total_xp += part["xp"]
+        for cat, xp in part["skill_xp"].items():
+            if cat in skill_xp: skill_xp[cat] += xp
+        run_total_km += part["run_km"]
+        run_total_min += part["run_min"]
+
+        if part["sallyup_best"] > sallyup_best_min:
+            sallyup_best_min = part["sallyup_best"]
+            print(f"[DEBUG] Neuer All-Time Rekord gefunden: {sallyup_best_min} Min")
+
+        for goal_name, tag, count in part["goals"]:
+            if goal_name not in goal_progress:
+                goal = goal_rules.get(tag, {})
+                goal_progress[goal_name] = {
+                    "title": goal_name,
+                    "current": 0.0,
+                    "target": goal.get("target"),
+                    "unit": "Lektionen",
+                    "end_date": goal.get("end_date")
+                }
+            goal_progress[goal_name]["current"] += count
+
+        # Heutige Statistik
+        if d_str == latest_date:
+            latest_daily_stats["tasks_today"] += part["tasks"]
+            latest_daily_stats["total_xp_today"] += part["xp"]
+            latest_daily_stats["minutes_today"] += part["minutes"]
+            for cat, xp in part["skill_xp"].items():
+                latest_daily_stats["daily_breakdown"][cat] += xp
+            if part["completed"]:
+                latest_daily_stats.setdefault("completed_today", []).extend(part["completed"])
+
+    return {
+        "total_xp": total_xp,
+        "skill_xp": skill_xp,
+        "run_total_km": run_total_km,
+        "run_total_min": run_total_min,
+        "sallyup_best_min": sallyup_best_min,
+        "goal_progress": goal_progress,
+        "latest_date": latest_date,
+        "latest_daily_stats": latest_daily_stats
+    }
+
+# --- 5. KERN-SCAN (Inkrementell, --full erzwingt Neuaufbau) ---
+@contextmanager
+def timed_stage(report, name):
+    """ Misst die Dauer einer Pipeline-Stufe in report["timings"][name] (Sekunden). """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if report is not None:
+            timings = report.setdefault("timings", {})
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+def run_sync(vault_path, full=False, jobs=1, report=None, touched=None):
+    """
+    Parst und aggregiert den Vault genau einmal und liefert das Ausgabe-Dict (ohne JSON/HTML zu schreiben).
+    Aktualisiert werden nur die inkrementellen Stores (Manifest, Siegel, Task-Index, Rollups, Präfix-Arrays).
+    `report` (optional) sammelt Zeiten und Zähler je Stufe; `touched` sind bekannte geänderte relative Pfade
+    (Watch-Modus), deren Monatsordner auch bei gültigem Siegel neu geprüft werden.
+    """
+    with timed_stage(report, "rules"):
+        TAG_RULES, SKILL_CATEGORIES, GOAL_RULES, TAG_MATCHER, rules_key = load_rules_snapshot(
+            vault_path, stage_counters(report, "rules"))
+
+    with timed_stage(report, "seals"):
+        tags_key = rules_fingerprint(TAG_MATCHER.tags)
+        seals, seal_rules_match, seal_tags_match = ({}, True, True) if full else load_seals(vault_path, rules_key, tags_key)
+
+    with timed_stage(report, "walk"):
+        touched_months = {month_of(p.replace(os.sep, "/"), JOURNAL_DIR_NAME) for p in touched or ()}
+        walked, all_files, stats, reused, fingerprints = plan_vault_scan(vault_path, seals, touched_months, full, report)
+        if report is not None:
+            # Ordner-Listings aus dem Cache (rpg_walker) bzw. versiegelte Monate, die nicht betreten wurden
+            bump(stage_counters(report, "walk"), files=sum(len(files) for files in walked.values()),
+                 cache_hits=report["walked_dirs"] - report["listed_dirs"], cache_misses=report["listed_dirs"])
+            bump(stage_counters(report, "seals"), cache_hits=len(reused),
+                 cache_misses=sum(1 for month in fingerprints if month in seals))
+
+    with timed_stage(report, "journal"):
+        entries, rules_match, tags_match = ({}, True, True) if full else load_manifest(vault_path, rules_key, tags_key)
+        broken = {month: seal for month, seal in seals.items() if month not in reused}
+        # Einträge gebrochener Siegel gelten wie Manifest-Einträge (nur geänderte Dateien werden gelesen), sofern sie
+        # mit denselben Regeln bewertet wurden wie das Manifest; sonst gelten alle ihre Dateien als geändert
+        merge = (seal_rules_match, seal_tags_match) == (rules_match, tags_match)
+        if merge:
+            entries = dict(entries)
+            for seal in broken.values():
+                entries.update((rel, entry) for _, rel, entry in seal["files"])
+        partials, new_entries, changed = collect_partials(
+            vault_path, all_files, TAG_MATCHER, GOAL_RULES, entries, rules_match, tags_match, jobs, report, stats)
+        if not merge:
+            for seal in broken.values():
+                changed.update(rel for _, rel, _ in seal["files"])
+        if not (seal_rules_match and seal_tags_match) and reused:
+            # Regeln geändert: versiegelte Task-Spalten neu bewerten statt die Monate neu zu parsen
+            reused, rescored = rescore_seals(reused, TAG_MATCHER, GOAL_RULES, seal_tags_match)
+            changed.update(rescored)
+            if report is not None:
+                report["rescored"] += len(rescored)
+        partials, new_seals, manifest_entries = apply_seals(vault_path, all_files, partials, new_entries, reused, fingerprints)
+        payload = None
+        if changed or full or manifest_entries.keys() != entries.keys():
+            payload = manifest_payload(rules_key, tags_key, manifest_entries)
+        seals_dirty = (not seal_rules_match or not seal_tags_match or new_seals.keys() != seals.keys()
+                       or any(new_seals[m] is not seals.get(m) for m in new_seals))
+        if report is not None:
+            report["sealed"] = len(reused)
+
+    with timed_stage(report, "index"):
+        try:
+            # Versiegelte Einträge gehören ebenfalls in den Index (bei geänderten Regeln neu bewertet)
+            index_entries = dict(new_entries)
+            for seal in reused.values():
+                index_entries.update((rel, entry) for _, rel, entry in seal["files"])
+            indexed = sync_task_index(vault_path, index_entries, TAG_MATCHER, rules_key, score_tasks, changed)
+        except sqlite3.Error as e:
+            # Der Index ist ein Zusatz: ein Fehler darf den Sync nicht abbrechen
+            print(f"[WARN] Task-Index nicht aktualisiert: {e}")
+            indexed = 0
+        if report is not None:
+            report["indexed"] = indexed
+
+    with timed_stage(report, "rollups"):
+        rolled = update_rollups(vault_path, partials, changed, SKILL_CATEGORIES, full)
+        if report is not None:
+            report["rolled_days"] = rolled
+
+    with timed_stage(report, "prefix"):
+        update_prefix(vault_path, partials, changed, SKILL_CATEGORIES, full,
+                      content_hash(payload.encode("utf-8")) if payload is not None else None)
+
+    stores = {}
+    with timed_stage(report, "streaks"):
+        stores["streak_bits"] = update_streaks(vault_path, partials, changed, TAG_MATCHER.tags, full)
+
+    with timed_stage(report, "goals"):
+        stores["goals"] = update_goal_index(vault_path, partials, changed, full)
+
+    with timed_stage(report, "people"):
+        stores["people"] = update_people(vault_path, partials, changed, walked["people"], full,
+                                         stage_counters(report, "people"))
+
+    # Siegel und Manifest erst nach allen abgeleiteten Stores sichern: sie bestimmen `changed` des nächsten Laufs.
+    # Bricht ein Sync vorher ab, sehen Index, Rollups, Präfix, Streaks, Ziele und Personen dieselben Änderungen erneut
+    with timed_stage(report, "commit"):
+        if seals_dirty:
+            save_seals(vault_path, rules_key, tags_key, new_seals)
+        if payload is not None:
+            save_manifest(vault_path, payload)
+
+    with timed_stage(report, "mood"):
+        stores["mood"] = update_mood(vault_path, walked["mood"], full, stage_counters(report, "mood"))
+        stores["thoughts"] = thought_activity(walked["thoughts"])
+        stores["skills"] = skill_tree(walked["skills"])
+        stores["core"] = {rel for rel, _, _ in walked["core"]}
+
+    with timed_stage(report, "aggregate"):
+        output = build_output(vault_path, partials, SKILL_CATEGORIES, GOAL_RULES, TAG_MATCHER, stores,
+                              stage_counters(report, "aggregate"))
+    return output
+
+def build_output(vault_path, partials, skill_categories, goal_rules, tag_matcher, stores=None, counters=None):
+    """
+    Aggregiert die Teil-Aggregate, liest die offenen Quests und baut das finale JSON-Dict.
+    `stores` sind die inkrementell gepflegten Indizes aus run_sync (streak_bits, goals, people, mood,
+    thoughts, skills, core); `counters` (rpg_profile) zählt das Lesen der ToDo-Liste.
+    """
+    stores = stores or {}
+    totals = reduce_partials(partials, skill_categories, goal_rules)
+    totals["records"] = reduce_records(partials, dict(zip(tag_matcher.tags, tag_matcher.rules)))
+    totals["running"] = run_analytics(partials)
+    if "streak_bits" in stores:
+        totals["streaks"] = streak_stats(stores["streak_bits"], totals["latest_date"])
+    open_tasks = read_open_tasks(vault_path, skill_categories, tag_matcher, stores.get("core"), counters)
+    apply_goal_deadlines(totals["goal_progress"], totals["latest_date"])
+    if "goals" in stores:
+        apply_goal_forecast(totals["goal_progress"], stores["goals"], totals["latest_date"])
+    if "people" in stores:
+        totals["people"] = people_stats(*stores["people"], totals["latest_date"])
+    if "mood" in stores:
+        totals["mood"] = mood_stats(stores["mood"])
+    if "thoughts" in stores:
+        totals["thoughts"] = stores["thoughts"]
+        totals["skills"] = stores["skills"]
+    return format_output(totals, open_tasks)
+
+def read_open_tasks(vault_path, skill_categories, tag_matcher, core_files=None, counters=None):
+    """ ToDo-Liste (Offene Quests) je Kategorie. `core_files` (rel. Pfade aus dem Vault-Durchlauf) spart den exists-Check. """
+    open_tasks = {cat: [] for cat in skill_categories}
     todo_file = os.path.join(vault_path, TODO_LIST_PATH)
-    if os.path.exists(todo_file):
+    if TODO_LIST_PATH in core_files if core_files is not None else os.path.exists(todo_file):
         with open(todo_file, "r", encoding="utf-8") as f:
-            for t in re.findall(r'^\s*- \[ \]\s*(.*)', f.read(), re.MULTILINE):
-                cat = get_task_category(t, TAG_RULES)
-                stats["open_tasks"].setdefault(cat, []).append(t.strip())
+            content = f.read()
+        tasks = OPEN_TASK_RE.findall(content)
+        for t in tasks:
+            cat = get_task_category(t, tag_matcher)
+            open_tasks.setdefault(cat, []).append(t.strip())
+        bump(counters, files_read=1, bytes_read=len(content.encode("utf-8")), tasks_parsed=len(tasks), regex_calls=1)
+    return open_tasks
 
-    if stats["latest_date"]:
-        try:
-            current_date = datetime.date.fromisoformat(stats["latest_date"])
-        except ValueError:
-            current_date = None
-        if current_date:
-            for goal in goal_progress.values():
-                target = goal.get("target")
-                if target is None:
-                    continue
-                remaining = max(target - goal.get("current", 0), 0)
-                goal["remaining"] = round(remaining, 2)
-                end_date = goal.get("end_date")
-                if end_date:
-                    try:
-                        end_dt = datetime.date.fromisoformat(end_date)
-                    except ValueError:
-                        end_dt = None
-                    if end_dt:
-                        days_remaining = max((end_dt - current_date).days, 0)
-                        goal["days_remaining"] = days_remaining
-                        if days_remaining > 0:
-                            goal["daily_workload"] = round(remaining / days_remaining, 2)
-                        else:
-                            goal["daily_workload"] = round(remaining, 2)
-
-    # Finales JSON
-    output = {
-        "total_xp": round(total_xp, 2),
-        "skill_xp_gained": {k: round(v, 2) for k, v in skill_xp.items()},
+def thought_activity(files):
+    """ Anzahl Notizen je 05_Thoughts-Unterordner (wie v4) und deren passive XP nach PASSIVE_THOUGHT_XP. """
+    counts = dict.fromkeys(PASSIVE_THOUGHT_XP, 0)
+    for rel, _, _ in files:
+        parts = rel.split("/")
+        if len(parts) == 3:
+            counts[parts[1]] = counts.get(parts[1], 0) + 1
+    xp = sum(count * PASSIVE_THOUGHT_XP.get(cat, 0.0) for cat, count in counts.items())
+    return {"counts": counts, "xp": xp}
+
+def skill_tree(files):
+    """ Skill-Struktur aus 03_Skills wie in v4: {ordner: [skill, ...]} (Ordner der Notiz, Name ohne .md). """
+    skills = {}
+    for rel, _, _ in files:
+        parts = rel.split("/")
+        skills.setdefault(parts[-2], []).append(parts[-1][:-3])
+    return skills
+
+def apply_goal_deadlines(goal_progress, latest_date):
+    """ Ergänzt remaining, days_remaining und daily_workload relativ zu `latest_date`. """
+    if not latest_date:
+        return
+    try:
+        current_date = datetime.date.fromisoformat(latest_date)
+    except ValueError:
+        return
+    for goal in goal_progress.values():
+        target = goal.get("target")
+        if target is None:
+            continue
+        remaining = max(target - goal.get("current", 0), 0)
+        goal["remaining"] = round(remaining, 2)
+        end_date = goal.get("end_date")
+        if end_date:
+            try:
+                end_dt = datetime.date.fromisoformat(end_date)
+            except ValueError:
+                end_dt = None
+            if end_dt:
+                days_remaining = max((end_dt - current_date).days, 0)
+                goal["days_remaining"] = days_remaining
+                if days_remaining > 0:
+                    goal["daily_workload"] = round(remaining / days_remaining, 2)
+                else:
+                    goal["daily_workload"] = round(remaining, 2)
+
+def format_output(totals, open_tasks):
+    """ Finales JSON aus den Gesamtwerten (Form von reduce_partials). """
+    return {
+        "total_xp": round(totals["total_xp"], 2),
+        "skill_xp_gained": {k: round(v, 2) for k, v in totals["skill_xp"].items()},
         "run_metrics": {
-            "total_km": round(run_total_km, 2),
-            "total_minutes": round(run_total_min, 1)
+            "total_km": round(totals["run_total_km"], 2),
+            "total_minutes": round(totals["run_total_min"], 1)
         },
-        "sallyup_best_time": sallyup_best_min,
-        "last_processed_date": stats["latest_date"],
-        "open_tasks": stats["open_tasks"],
-        "latest_daily_stats": stats["latest_daily_stats"],
-        "goal_progress": list(goal_progress.values())
+        "sallyup_best_time": totals["sallyup_best_min"],
+        "last_processed_date": totals["latest_date"],
+        "open_tasks": open_tasks,
+        "latest_daily_stats": totals["latest_daily_stats"],
+        "goal_progress": list(totals["goal_progress"].values()),
+        # Rekorde, Lauf-Analyse, Streaks, Personen und Stimmung (fehlen bei --as-of, dort gibt es nur die Präfix-Arrays)
+        "records": totals.get("records", {}),
+        "running": totals.get("running", {}),
+        "streaks": totals.get("streaks", {}),
+        "people": totals.get("people", {}),
+        # Passive XP (Moodlog-Tags und Gedanken) wird wie in v4 separat ausgewiesen; total_xp bleibt die aktive XP
+        "passive_xp": round(totals.get("mood", {}).get("passive_xp", 0.0) + totals.get("thoughts", {}).get("xp", 0.0), 2),
+        "mood": totals.get("mood", {}),
+        "thought_activity": totals.get("thoughts", {}).get("counts", {}),
+        "skills": totals.get("skills", {})
     }
-    
-    with open(os.path.join(vault_path, JSON_CACHE_PATH), "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2)
-
-    update_dashboard_html(vault_path, output)
-    
-    print(f"--- Full Sync v5 ---")
-    print(f"Heute erledigt: {stats['latest_daily_stats']['tasks_today']} Aufgaben")
+
+def load_current_prefix(vault_path):
+    """
+    Präfix-Arrays auf dem Stand der Journale: ein inkrementeller Sync (ohne Ausgaben zu schreiben) holt Änderungen
+    seit dem letzten Lauf nach. Gehören die Arrays danach nicht zum Manifest (älteres Format), wird voll synchronisiert.
+    """
+    run_sync(vault_path)
+    prefix = load_prefix(vault_path)
+    if not is_current_prefix(vault_path, prefix):
+        run_sync(vault_path, full=True)
+        prefix = load_prefix(vault_path)
+    return prefix
+
+def build_as_of_output(vault_path, day):
+    """
+    Stand zum Datum `day` in der Form von life_rpg_data_v5.json, aus den Präfix-Arrays (Binärsuche, kein Rescan).
+    Ziele beziehen Restmenge und Tagespensum auf diesen Tag; offene Quests sind nur für heute bekannt und bleiben leer.
+    """
+    _, SKILL_CATEGORIES, GOAL_RULES, _, _ = load_rules_snapshot(vault_path)
+    prefix = load_current_prefix(vault_path)
+    totals = totals_as_of(prefix, day, GOAL_RULES)
+    if totals["latest_date"] and os.path.exists(os.path.join(vault_path, INDEX_PATH)):
+        conn = open_index(vault_path)
+        try:
+            completed = completed_on(conn, totals["latest_date"][:10])
+        finally:
+            conn.close()
+        if completed:
+            totals["latest_daily_stats"]["completed_today"] = completed
+    apply_goal_deadlines(totals["goal_progress"], totals["latest_date"])
+    return format_output(totals, {cat: [] for cat in SKILL_CATEGORIES})
+
+def build_range_output(vault_path, since, until):
+    """ Zuwachs zwischen zwei Daten aus den Präfix-Arrays. """
+    prefix = load_current_prefix(vault_path)
+    return range_delta(prefix, since, until)
+
+def write_json_cache(vault_path, output, state):
+    """ Schreibt den JSON-Cache nur bei geändertem Inhalt (atomar); True, wenn geschrieben wurde. """
+    return write_output(vault_path, JSON_CACHE_PATH, json.dumps(output, indent=2), state)
+
+def print_summary(output, report, full=False):
+    print(f"--- {'Full' if full else 'Inkrementeller'} Sync v5 ---")
+    print(f"Journale: {report['files']} gesamt, {report['parsed']} neu geparst, {report['rescored']} neu bewertet, {report['removed']} entfernt, {report.get('sealed', 0)} Monat(e) versiegelt übersprungen")
+    print(f"Task-Index: {report.get('indexed', 0)} Datei(en) neu indiziert")
+    print(f"Heute erledigt: {output['latest_daily_stats']['tasks_today']} Aufgaben")
     print(f"Laufen Gesamt: {output['run_metrics']['total_km']} km")
     print(f"SallyUp Bestzeit: {output['sallyup_best_time']} min")
+    written = report.get("written")
+    if written is not None:
+        print(f"Ausgaben geschrieben: {', '.join(written) if written else 'keine (unverändert)'}")
+
+def write_outputs(vault_path, output, report):
+    """ JSON-Cache, Shards und Dashboard-HTML; geschrieben wird nur, was sich geändert hat (report["written"]). """
+    state = load_output_state(vault_path)
+    written = []
+    with timed_stage(report, "json"):
+        if write_json_cache(vault_path, output, state):
+            written.append(JSON_CACHE_PATH)
+        written.extend(write_shards(vault_path, output, state))
+        bump(stage_counters(report, "json"), files_written=len(written))
+    with timed_stage(report, "html"):
+        if update_dashboard_html(vault_path, output, state):
+            written.append(HTML_DASHBOARD_PATH)
+            bump(stage_counters(report, "html"), files_written=1)
+    if written:
+        save_output_state(vault_path, state)
+    report["written"] = written
+    return written
 
-def update_dashboard_html(vault_path, data):
+def scan_vault(vault_path, full=False, jobs=1, report=None, touched=None):
+    report = {} if report is None else report
+    output = run_sync(vault_path, full, jobs, report, touched)
+    write_outputs(vault_path, output, report)
+    print_summary(output, report, full)
+    return output
+
+def update_dashboard_html(vault_path, data, state=None):
+    """
+    Setzt die Summary aus `data` (rpg_shards) als kleinen MOCK_DATA-Fallback zwischen die Marker des Dashboards;
+    alles Weitere lädt das Dashboard als Shards nach. Geschrieben (atomar) wird nur, wenn sich der Datenblock seit
+    dem letzten Schreiben geändert hat; ohne `state` wird der Ausgabe-Stand selbst geladen und gesichert.
+    Gibt True zurück, wenn das HTML neu geschrieben wurde.
+    """
     html_full_path = os.path.join(vault_path, HTML_DASHBOARD_PATH)
     if not os.path.exists(html_full_path):
         print(f"[WARN] Dashboard-HTML nicht gefunden: {html_full_path}")
-        return
+        return False
 
-    try:
+    own_state = state is None
+    if own_state:
+        state = load_output_state(vault_path)
+
+    def render(new_data_block):
         with open(html_full_path, "r", encoding="utf-8") as f:
             html_content = f.read()
-
-        json_string = json.dumps(data, indent=JSON_INDENT_SPACES, ensure_ascii=False)
-        new_data_block = f"{START_MARKER}\n    const MOCK_DATA = {json_string};\n{END_MARKER}"
-
         start_index = html_content.index(START_MARKER)
         end_index = html_content.index(END_MARKER) + len(END_MARKER)
+        return html_content[:start_index].rstrip() + "\n" + new_data_block + html_content[end_index:]
 
-        new_html_content = html_content[:start_index].rstrip() + "\n" + new_data_block + html_content[end_index:]
-
-        with open(html_full_path, "w", encoding="utf-8") as f:
-            f.write(new_html_content)
-
-        print("[DEBUG] Dashboard-HTML mit aktuellen JSON-Daten aktualisiert.")
+    try:
+        json_string = json.dumps(summary_shard(data), indent=JSON_INDENT_SPACES, ensure_ascii=False)
+        new_data_block = f"{START_MARKER}\n    const MOCK_DATA = {json_string};\n{END_MARKER}"
+        written = write_output(vault_path, HTML_DASHBOARD_PATH, new_data_block, state, render)
     except ValueError:
         print(f"[WARN] Marker für JSON-Injektion in {HTML_DASHBOARD_PATH} nicht gefunden.")
+        return False
     except Exception as e:
         print(f"[WARN] Dashboard-Update fehlgeschlagen: {e}")
+        return False
+
+    if written:
+        print("[DEBUG] Dashboard-HTML mit aktuellen JSON-Daten aktualisiert.")
+        if own_state:
+            save_output_state(vault_path, state)
+    return written
 
 if __name__ == "__main__":
-    scan_vault(sys.argv[1] if len(sys.argv) > 1 else ".")
+    parser = argparse.ArgumentParser(description="Life-RPG Sync v5")
+    parser.add_argument("vault_path", nargs="?", default=".")
+    parser.add_argument("--full", action="store_true", help="Manifest ignorieren und alle Journale neu parsen")
+    parser.add_argument("--jobs", type=int, default=1, help="Anzahl Prozesse für das Parsen (0 = alle CPU-Kerne)")
+    parser.add_argument("--as-of", dest="as_of", metavar="DATUM", help="Stand zu einem Datum (YYYY-MM-DD) als JSON ausgeben")
+    parser.add_argument("--since", metavar="DATUM", help="Mit --as-of: Zuwachs seit diesem Datum statt Gesamtstand")
+    parser.add_argument("--out", help="JSON für --as-of in diese Datei statt auf stdout")
+    parser.add_argument("--profile", action="store_true", help="Zeiten und Zähler je Stufe nach 08_System/rpg_profile_v5.json schreiben")
+    parser.add_argument("--cprofile", action="store_true", help="Mit --profile zusätzlich einen cProfile-Dump schreiben")
+    parser.add_argument("--slowest", type=int, default=SLOWEST_FILES, metavar="N", help="Anzahl langsamster Dateien im Profil")
+    args = parser.parse_args()
+    for option, value in (("--as-of", args.as_of), ("--since", args.since)):
+        try:
+            if value:
+                datetime.date.fromisoformat(value)
+        except ValueError:
+            parser.error(f"{option}: ungültiges Datum '{value}' (erwartet YYYY-MM-DD)")
+    if args.as_of:
+        # stdout gehört dem JSON: Fortschritts- und Debug-Ausgaben eines nötigen Syncs gehen nach stderr
+        with redirect_stdout(sys.stderr):
+            if args.since:
+                result = build_range_output(args.vault_path, args.since, args.as_of)
+            else:
+                result = build_as_of_output(args.vault_path, args.as_of)
+        payload = json.dumps(result, indent=2, ensure_ascii=False)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                f.write(payload)
+        else:
+            print(payload)
+        sys.exit(0)
+    jobs = args.jobs or os.cpu_count() or 1
+    if args.profile or args.cprofile:
+        profile_sync(args.vault_path, lambda report: scan_vault(args.vault_path, args.full, jobs, report),
+                     args.full, jobs, args.cprofile, args.slowest)
+    else:
+        scan_vault(args.vault_path, full=args.full, jobs=jobs)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# rpg_goals.py
+# Ziel: Ziel-Index (Zielname -> Regel-Tag und Zuwachs je Tag), inkrementell je geändertem Tag gepatcht;
+#       daraus Burn-down, Velocity und eine Prognose des Abschlussdatums per linearer Regression
+
+import os, json, math, datetime
+
+from rpg_rollups import day_of, parse_day
+from rpg_xp_kernel import np
+
+GOALS_PATH = '08_System/rpg_goals_v5.json'
+GOALS_VERSION = 1
+VELOCITY_DAYS = 28     # Fenster für die aktuelle Geschwindigkeit (Einheiten pro Tag)
+REGRESSION_DAYS = 56   # Fenster für die Trendgerade des kumulierten Fortschritts
+
+
+def load_goal_index(vault_path):
+    goal_file = os.path.join(vault_path, GOALS_PATH)
+    try:
+        with open(goal_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (IOError, ValueError):
+        return None
+    return data["goals"] if data.get("version") == GOALS_VERSION else None
+
+
+def save_goal_index(vault_path, goals):
+    goal_file = os.path.join(vault_path, GOALS_PATH)
+    os.makedirs(os.path.dirname(goal_file), exist_ok=True)
+    payload = json.dumps({"version": GOALS_VERSION, "goals": goals}, ensure_ascii=False, separators=(",", ":"))
+    with open(goal_file, "w", encoding="utf-8") as f:
+        f.write(payload)
+
+
+def update_goal_index(vault_path, partials, changed_paths, full=False):
+    """
+    Liefert {zielname: {"tag": regel_tag, "days": {tag: zuwachs}}}. Nur die Tage der geänderten Pfade
+    werden aus den Teil-Aggregaten (partial["goals"]) neu eingetragen; ohne Datei oder mit --full alle.
+    """
+    goals = None if full else load_goal_index(vault_path)
+    if goals is None:
+        goals, touched = {}, None
+    else:
+        touched = {day_of(p) for p in changed_paths}
+        if not touched:
+            return goals
+        for goal in goals.values():
+            for day in touched:
+                goal["days"].pop(day, None)
+
+    for d_str, part in partials:
+        day = d_str[:10]
+        if touched is not None and day not in touched:
+            continue
+        for goal_name, tag, count in part["goals"]:
+            goal = goals.setdefault(goal_name, {"tag": tag, "days": {}})
+            goal["days"][day] = goal["days"].get(day, 0.0) + count
+    for name in [name for name, goal in goals.items() if not goal["days"]]:
+        del goals[name]
+    save_goal_index(vault_path, goals)
+    return goals
+
+
+def _trend_slope(increments):
+    """ Steigung (Einheiten/Tag) der Regressionsgeraden durch den kumulierten Fortschritt. """
+    n = len(increments)
+    if n < 2:
+        return 0.0
+    if np is not None:
+        y = np.cumsum(np.asarray(increments, dtype=np.float64))
+        x = np.arange(n, dtype=np.float64)
+        x -= x.mean()
+        return float((x * (y - y.mean())).sum() / (x * x).sum())
+    y, total = [], 0.0
+    for inc in increments:
+        total += inc
+        y.append(total)
+    x_mean, y_mean = (n - 1) / 2.0, sum(y) / n
+    num = sum((i - x_mean) * (v - y_mean) for i, v in enumerate(y))
+    den = sum((i - x_mean) ** 2 for i in range(n))
+    return num / den
+
+
+def apply_goal_forecast(goal_progress, goals, latest_date):
+    """
+    Ergänzt je Ziel mit Zielwert: velocity_28d, trend_per_day, projected_completion, on_track und burndown
+    ([[tag, rest], ...] an Tagen mit Zuwachs). Bezugstag ist der letzte Journaltag.
+    """
+    ref = parse_day(latest_date)
+    if ref is None:
+        return
+    for name, entry in goal_progress.items():
+        goal = goals.get(name)
+        target = entry.get("target")
+        if goal is None or target is None:
+            continue
+        days = sorted(goal["days"].items())
+
+        window = [0.0] * REGRESSION_DAYS
+        for day, inc in days:
+            date = parse_day(day)
+            if date is None:
+                continue
+            offset = (ref - date).days
+            if 0 <= offset < REGRESSION_DAYS:
+                window[REGRESSION_DAYS - 1 - offset] += inc
+        velocity = sum(window[-VELOCITY_DAYS:]) / VELOCITY_DAYS
+        slope = _trend_slope(window)
+
+        burndown, done, finished_on = [], 0.0, None
+        for day, inc in days:
+            done += inc
+            burndown.append([day, round(max(target - done, 0.0), 2)])
+            if finished_on is None and done >= target:
+                finished_on = day
+        remaining = max(target - entry.get("current", 0.0), 0.0)
+        if finished_on:
+            projected = finished_on
+        elif slope > 0:
+            projected = (ref + datetime.timedelta(days=math.ceil(remaining / slope))).isoformat()
+        else:
+            projected = None
+
+        entry["velocity_28d"] = round(velocity, 3)
+        entry["trend_per_day"] = round(slope, 3)
+        entry["projected_completion"] = projected
+        end_date = entry.get("end_date")
+        entry["on_track"] = (projected is not None and projected <= end_date) if end_date else None
+        entry["burndown"] = burndown
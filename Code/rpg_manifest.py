@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# rpg_manifest.py
+# Ziel: Persistentes Manifest für den inkrementellen Journal-Scan (Pfad, mtime, Größe, Hash, Task-Spalten, Teil-Aggregate)
+
+import os, json, hashlib
+
+MANIFEST_PATH = '08_System/rpg_manifest_v5.json'
+MANIFEST_VERSION = 3
+
+
+def content_hash(raw_bytes):
+    """ Liefert den Inhalts-Hash einer Datei (sha1 reicht zur Änderungserkennung). """
+    return hashlib.sha1(raw_bytes).hexdigest()
+
+
+def rules_fingerprint(*rule_parts):
+    """ Fingerprint der geladenen Regeln. Ändern sich Regeln, sind alle Teil-Aggregate ungültig. """
+    payload = json.dumps(rule_parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def load_manifest(vault_path, rules_key, tags_key):
+    """
+    Lädt das Manifest und liefert (files, rules_match, tags_match).
+    Bei fehlender Datei oder anderer Version: leeres Manifest. Bei geänderten Regeln bleiben die
+    Task-Spalten gültig, nur die Teil-Aggregate müssen neu bewertet werden (rules_match = False).
+    Die Spalte "tag_ids" bleibt gültig, solange die Tag-Liste selbst gleich ist (tags_match).
+    """
+    manifest_file = os.path.join(vault_path, MANIFEST_PATH)
+    if not os.path.exists(manifest_file):
+        return {}, True, True
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (IOError, ValueError) as e:
+        print(f"[WARN] Manifest unlesbar, führe Full-Scan aus: {e}")
+        return {}, True, True
+    if data.get("version") != MANIFEST_VERSION:
+        return {}, True, True
+    return data.get("files", {}), data.get("rules_key") == rules_key, data.get("tags_key") == tags_key
+
+
+def manifest_payload(rules_key, tags_key, files):
+    """ Serialisiertes Manifest; sein Hash (manifest_digest) stempelt abgeleitete Dateien schon vor dem Schreiben. """
+    data = {"version": MANIFEST_VERSION, "rules_key": rules_key, "tags_key": tags_key, "files": files}
+    # json.dumps nutzt den C-Encoder, json.dump(f) den deutlich langsameren Python-Pfad
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def save_manifest(vault_path, payload):
+    manifest_file = os.path.join(vault_path, MANIFEST_PATH)
+    os.makedirs(os.path.dirname(manifest_file), exist_ok=True)
+    with open(manifest_file, "w", encoding="utf-8") as f:
+        f.write(payload)
+
+
+def manifest_digest(vault_path):
+    """ Inhalts-Hash der gespeicherten Manifest-Datei oder None, wenn es (noch) keine gibt. """
+    try:
+        with open(os.path.join(vault_path, MANIFEST_PATH), "rb") as f:
+            return content_hash(f.read())
+    except IOError:
+        return None
+
+
+def check_entry(entries, rel_path, full_path, st=None):
+    """
+    Prüft eine Datei per stat gegen das Manifest (`st` aus dem Vault-Durchlauf spart den zweiten stat).
+    Gibt (entry, st) zurück: entry ist der wiederverwendbare Eintrag (mtime und Größe gleich) oder None.
+    """
+    if st is None:
+        st = os.stat(full_path)
+    entry = entries.get(rel_path)
+    if entry and entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size:
+        return entry, st
+    return None, st
+
+
+def make_entry(st, digest, tasks, partial):
+    return {"mtime": st.st_mtime_ns, "size": st.st_size, "sha1": digest, "tasks": tasks, "partial": partial}
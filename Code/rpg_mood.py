@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# rpg_mood.py
+# Ziel: Stimmungs-Tags aus 04_Emotions/Moodlog wie in v4 zählen, aber je Datei als Counter mit Fingerprint
+#       (mtime, Größe) ablegen: nur geänderte Dateien werden neu zerlegt; dazu passive XP und eine Tages-Serie
+
+import os, re, json, datetime
+from collections import Counter
+
+from rpg_profile import bump
+
+MOOD_PATH = '08_System/rpg_mood_v5.json'
+MOOD_VERSION = 1
+# Passive XP je Vorkommen eines Stimmungs-Tags (Tabelle aus calculate_xp_v4)
+PASSIVE_TAG_XP = {"#produktiv": 5.0, "#gelesen": 3.0, "#trainiert": 8.0, "#erfolgreich": 10.0}
+DATE_PREFIX_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+
+def load_mood(vault_path):
+    mood_file = os.path.join(vault_path, MOOD_PATH)
+    try:
+        with open(mood_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (IOError, ValueError):
+        return None
+    return data["files"] if data.get("version") == MOOD_VERSION else None
+
+
+def save_mood(vault_path, files):
+    mood_file = os.path.join(vault_path, MOOD_PATH)
+    os.makedirs(os.path.dirname(mood_file), exist_ok=True)
+    payload = json.dumps({"version": MOOD_VERSION, "files": files}, ensure_ascii=False, separators=(",", ":"))
+    with open(mood_file, "w", encoding="utf-8") as f:
+        f.write(payload)
+
+
+def count_mood_tags(content):
+    """ v4-Zerlegung: Wörter mit '#' am Anfang, Satzzeichen am Ende abgeschnitten (Überschriften-# zählen nicht). """
+    return Counter(word.rstrip('.,!?"\'') for word in content.split() if word.startswith("#") and word.strip("#"))
+
+
+def mood_day(name, mtime_ns):
+    """ Tag eines Eintrags: Datum am Anfang des Dateinamens, sonst der Tag der letzten Änderung. """
+    m = DATE_PREFIX_RE.match(name)
+    if m:
+        return m.group(0)
+    return datetime.date.fromtimestamp(mtime_ns / 1e9).isoformat()
+
+
+def update_mood(vault_path, files, full=False, counters=None):
+    """
+    Liefert {rel_pfad: {"mtime", "size", "day", "tags": {tag: anzahl}}} aller Moodlog-Dateien.
+    `files` kommen aus dem Vault-Durchlauf (rpg_walker); Dateien mit unverändertem Fingerprint werden
+    aus dem Store übernommen, ohne sie zu öffnen. `counters` (rpg_profile) zählt Treffer und gelesene Dateien.
+    """
+    cached = None if full else load_mood(vault_path)
+    cached = cached or {}
+    entries, changed = {}, False
+    for rel_path, full_path, st in files:
+        old = cached.get(rel_path)
+        if old and old["mtime"] == st.st_mtime_ns and old["size"] == st.st_size:
+            entries[rel_path] = old
+            bump(counters, cache_hits=1)
+            continue
+        name = os.path.basename(full_path)
+        try:
+            with open(full_path, "r", encoding="utf-8") as infile:
+                tags = count_mood_tags(infile.read())
+        except (IOError, UnicodeDecodeError) as e:
+            print(f"Error reading file {name}: {e}")
+            continue
+        entries[rel_path] = {"mtime": st.st_mtime_ns, "size": st.st_size,
+                             "day": mood_day(name, st.st_mtime_ns), "tags": dict(tags)}
+        bump(counters, cache_misses=1, files_read=1, bytes_read=st.st_size, regex_calls=1)
+        changed = True
+    if changed or full or entries.keys() != cached.keys():
+        save_mood(vault_path, entries)
+    return entries
+
+
+def mood_stats(files):
+    """
+    Summiert die Datei-Counter: Tag-Zählung (häufigste zuerst), passive XP nach PASSIVE_TAG_XP mit
+    Aufschlüsselung und eine Tages-Serie (Spalten je Tag: Anzahl Tags, passive XP und je Tag-Name).
+    """
+    totals = Counter()
+    day_counts, day_xp, day_tags = Counter(), Counter(), {}
+    for entry in files.values():
+        tags = entry["tags"]
+        totals.update(tags)
+        day = entry["day"]
+        day_tags.setdefault(day, Counter()).update(tags)
+        day_counts[day] += sum(tags.values())
+        day_xp[day] += sum(count * PASSIVE_TAG_XP.get(tag, 0.0) for tag, count in tags.items())
+
+    breakdown = {tag: round(totals[tag] * xp, 2) for tag, xp in PASSIVE_TAG_XP.items() if totals[tag]}
+    days = sorted(day_counts)
+    return {
+        "tags": dict(sorted(totals.items(), key=lambda kv: (-kv[1], kv[0]))),
+        "passive_xp": round(sum(breakdown.values()), 2),
+        "xp_breakdown": breakdown,
+        "series": {
+            "days": days,
+            "tags": [day_counts[d] for d in days],
+            "xp": [round(day_xp[d], 2) for d in days],
+            "by_tag": {tag: [day_tags[d][tag] for d in days] for tag in sorted(totals)},
+        },
+    }
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# rpg_output.py
+# Ziel: Ausgaben (JSON-Cache, Dashboard-HTML) nur bei geändertem Inhalt schreiben: Hash des serialisierten
+#       Inhalts gegen den zuletzt geschriebenen vergleichen, atomar über Temp-Datei + os.replace ersetzen
+
+import os, json, stat, tempfile
+
+from rpg_manifest import content_hash
+
+OUTPUT_STATE_PATH = '08_System/rpg_outputs_v5.json'
+OUTPUT_STATE_VERSION = 1
+
+
+def load_output_state(vault_path):
+    """ {rel_pfad: {"digest", "mtime", "size"}} der zuletzt geschriebenen Ausgaben. """
+    state_file = os.path.join(vault_path, OUTPUT_STATE_PATH)
+    try:
+        with open(state_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (IOError, ValueError):
+        return {}
+    return data["outputs"] if data.get("version") == OUTPUT_STATE_VERSION else {}
+
+
+def save_output_state(vault_path, state):
+    payload = json.dumps({"version": OUTPUT_STATE_VERSION, "outputs": state}, separators=(",", ":"))
+    atomic_write(os.path.join(vault_path, OUTPUT_STATE_PATH), payload.encode("utf-8"))
+
+
+def atomic_write(path, data):
+    """
+    Schreibt `data` (bytes) in eine versteckte Temp-Datei im selben Ordner und ersetzt das Ziel per os.replace:
+    Leser (Obsidian, Browser, Sync-Client) sehen immer die alte oder die neue Datei, nie eine halbe.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except OSError:
+            mode = 0o644
+        os.chmod(tmp_path, mode)  # mkstemp legt 0600 an
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def is_current(vault_path, rel_path, payload, state):
+    """ True, wenn `rel_path` zuletzt mit genau `payload` geschrieben wurde und seitdem unverändert ist. """
+    entry = state.get(rel_path)
+    if not entry or entry["digest"] != content_hash(payload.encode("utf-8")):
+        return False
+    try:
+        st = os.stat(os.path.join(vault_path, rel_path))
+    except OSError:
+        return False
+    return entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size
+
+
+def write_output(vault_path, rel_path, payload, state, render=None):
+    """
+    Schreibt die Ausgabe `rel_path`, wenn sich der Hash von `payload` (str) seit dem letzten Schreiben geändert hat
+    oder die Datei inzwischen von außen verändert/gelöscht wurde (mtime/Größe weichen vom Stand ab).
+    `render(payload)` baut optional den Dateiinhalt (z.B. HTML-Vorlage mit eingesetztem JSON) erst bei Bedarf.
+    Gibt True zurück, wenn geschrieben wurde; `state` wird dann aktualisiert.
+    """
+    if is_current(vault_path, rel_path, payload, state):
+        return False
+    path = os.path.join(vault_path, rel_path)
+    digest = content_hash(payload.encode("utf-8"))
+    content = render(payload) if render else payload
+    atomic_write(path, content.encode("utf-8"))
+    st = os.stat(path)
+    state[rel_path] = {"digest": digest, "mtime": st.st_mtime_ns, "size": st.st_size}
+    return True
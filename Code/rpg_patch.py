@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# rpg_patch.py
+# Ziel: JSON-Patches im Stil von RFC 6902 (add/remove/replace mit JSON-Pointer) zwischen zwei Ausgaben
+#       und ein versioniertes Protokoll der letzten N Patches, damit Clients nur Änderungen nachladen
+
+import json
+
+MAX_PATCHES = 50
+
+
+def escape_pointer(key):
+    """ RFC 6901: '~' -> '~0', '/' -> '~1'. """
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _size(value):
+    return len(json.dumps(value, ensure_ascii=False, separators=(",", ":")))
+
+
+def diff(old, new, path=""):
+    """
+    Liefert die Operationen, die `old` in `new` überführen. Objekte werden schlüsselweise verglichen, Listen
+    elementweise (bei gleicher Länge) oder als angehängter/abgeschnittener Rest. Ist die Operationsliste eines
+    Teilbaums größer als der Teilbaum selbst (z.B. eine verschobene Zeitreihe), wird er als Ganzes ersetzt.
+    """
+    if old == new:
+        return []
+    ops = None
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key, value in new.items():
+            child = f"{path}/{escape_pointer(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(diff(old[key], value, child))
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{escape_pointer(key)}"})
+    elif isinstance(old, list) and isinstance(new, list):
+        n_old, n_new = len(old), len(new)
+        common = min(n_old, n_new)
+        if n_old == n_new or old[:common] == new[:common]:
+            ops = []
+            for i in range(common):
+                ops.extend(diff(old[i], new[i], f"{path}/{i}"))
+            for i in range(common, n_new):
+                ops.append({"op": "add", "path": f"{path}/{i}", "value": new[i]})
+            # Von hinten entfernen, damit die Indizes der übrigen Elemente gültig bleiben
+            for i in range(n_old - 1, common - 1, -1):
+                ops.append({"op": "remove", "path": f"{path}/{i}"})
+    replace = [{"op": "replace", "path": path, "value": new}]
+    if ops is None or not path:
+        return ops if ops is not None else replace
+    return ops if sum(_size(op) for op in ops) <= _size(replace[0]) else replace
+
+
+def _split_pointer(path):
+    return [part.replace("~1", "/").replace("~0", "~") for part in path.split("/")[1:]]
+
+
+def apply_patch(doc, ops):
+    """ Wendet `ops` auf `doc` an (in place, soweit möglich) und gibt das Ergebnis zurück. """
+    for op in ops:
+        keys = _split_pointer(op["path"])
+        if not keys:
+            doc = op.get("value")
+            continue
+        parent = doc
+        for key in keys[:-1]:
+            parent = parent[int(key)] if isinstance(parent, list) else parent[key]
+        last = keys[-1]
+        if isinstance(parent, list):
+            index = len(parent) if last == "-" else int(last)
+            if op["op"] == "add":
+                parent.insert(index, op["value"])
+            elif op["op"] == "remove":
+                del parent[index]
+            else:
+                parent[index] = op["value"]
+        elif op["op"] == "remove":
+            del parent[last]
+        else:
+            parent[last] = op["value"]
+    return doc
+
+
+def append_patch(log, ops, max_patches=MAX_PATCHES):
+    """ Hängt `ops` als nächste Version an das Protokoll {"version", "patches"} an (nur die letzten `max_patches`). """
+    log = log or {"version": 0, "patches": []}
+    version = log["version"] + 1
+    patches = log["patches"][-(max_patches - 1):] if max_patches > 1 else []
+    return {"version": version, "patches": patches + [{"version": version, "ops": ops}]}
+
+
+def patches_since(log, since):
+    """
+    {"version", "patches"} mit allen Patches nach Version `since`, oder {"version", "reset": True},
+    wenn ältere Patches schon verworfen wurden (der Client muss dann neu laden).
+    """
+    patches = [p for p in log["patches"] if p["version"] > since]
+    if since < log["version"] and (not patches or patches[0]["version"] != since + 1):
+        return {"version": log["version"], "reset": True}
+    return {"version": log["version"], "patches": patches}
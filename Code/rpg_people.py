@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# rpg_people.py
+# Ziel: Personen-Tracking aus v4 als inkrementeller Index: Personen-Notizen (02_People/**) mit "Nähe:" je mtime
+#       gecacht, [[Person]]-Links erledigter Aufgaben als Person -> {Tag: Anzahl}, nur für geänderte Tage gepatcht
+
+import os, re, json
+
+from rpg_rollups import day_of, parse_day
+from rpg_profile import bump
+
+PEOPLE_PATH = '08_System/rpg_people_v5.json'
+PEOPLE_VERSION = 1
+NOT_SEEN_DAYS = (14, 30, 90)   # Schwellen der "nicht gesehen seit N Tagen"-Listen
+CLOSENESS_RE = re.compile(r'^\s*nähe:\s*(\S+)', re.IGNORECASE | re.MULTILINE)
+
+
+def load_people(vault_path):
+    people_file = os.path.join(vault_path, PEOPLE_PATH)
+    try:
+        with open(people_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (IOError, ValueError):
+        return None
+    return data if data.get("version") == PEOPLE_VERSION else None
+
+
+def save_people(vault_path, notes, contacts):
+    people_file = os.path.join(vault_path, PEOPLE_PATH)
+    os.makedirs(os.path.dirname(people_file), exist_ok=True)
+    data = {"version": PEOPLE_VERSION, "notes": notes, "contacts": contacts}
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    with open(people_file, "w", encoding="utf-8") as f:
+        f.write(payload)
+
+
+def parse_closeness(content):
+    """ Erster "Nähe: X"-Wert einer Personen-Notiz (wie v4: fehlt oder unlesbar -> 0). """
+    m = CLOSENESS_RE.search(content)
+    if not m:
+        return 0.0
+    try:
+        return float(m.group(1).replace(",", "."))
+    except ValueError:
+        return 0.0
+
+
+def scan_people(files, cached=None, counters=None):
+    """
+    Liefert (notes, changed): {rel_pfad: {"mtime", "name", "group", "closeness"}} aller Personen-Notizen.
+    `files` sind die 02_People-Dateien aus dem Vault-Durchlauf ((rel_pfad, pfad, stat_result), rpg_walker).
+    Gelesen werden nur Notizen, deren mtime vom Cache abweicht; die Gruppe ist der erste Unterordner.
+    `counters` (rpg_profile) zählt Cache-Treffer und gelesene Notizen.
+    """
+    cached = cached or {}
+    notes, changed = {}, False
+    for rel_path, full_path, st in files:
+        old = cached.get(rel_path)
+        if old and old["mtime"] == st.st_mtime_ns:
+            notes[rel_path] = old
+            bump(counters, cache_hits=1)
+            continue
+        name = os.path.basename(full_path)[:-3]
+        try:
+            with open(full_path, "r", encoding="utf-8") as infile:
+                closeness = parse_closeness(infile.read())
+        except (IOError, UnicodeDecodeError) as e:
+            print(f"Error reading file {name}: {e}")
+            continue
+        bump(counters, cache_misses=1, files_read=1, bytes_read=st.st_size, regex_calls=1)
+        parts = rel_path.split("/")
+        notes[rel_path] = {"mtime": st.st_mtime_ns, "name": name,
+                           "group": parts[1] if len(parts) > 2 else None, "closeness": closeness}
+        changed = True
+    return notes, changed or notes.keys() != cached.keys()
+
+
+def update_people(vault_path, partials, changed_paths, files, full=False, counters=None):
+    """
+    Liefert (notes, contacts) mit contacts = {linkname: {tag: anzahl}} aus partial["links"].
+    Nur die Tage der geänderten Journale werden neu eingetragen; ohne Datei oder mit --full alles.
+    """
+    data = None if full else load_people(vault_path)
+    notes, notes_changed = scan_people(files, data["notes"] if data else None, counters)
+    if data is None:
+        contacts, touched = {}, None
+    else:
+        contacts = data["contacts"]
+        touched = {day_of(p) for p in changed_paths}
+        if not touched:
+            if notes_changed:
+                save_people(vault_path, notes, contacts)
+            return notes, contacts
+        for days in contacts.values():
+            for day in touched:
+                days.pop(day, None)
+
+    for d_str, part in partials:
+        day = d_str[:10]
+        if touched is not None and day not in touched:
+            continue
+        for name, count in part["links"].items():
+            days = contacts.setdefault(name, {})
+            days[day] = days.get(day, 0) + count
+    for name in [name for name, days in contacts.items() if not days]:
+        del contacts[name]
+    save_people(vault_path, notes, contacts)
+    return notes, contacts
+
+
+def people_stats(notes, contacts, latest_date):
+    """
+    Je bekannter Person (wie v4 zählen nur Links auf existierende Notizen): Nähe, Gruppe, Interaktionen,
+    letzter Kontakt und Tage seitdem (bezogen auf den letzten Journaltag), dazu "nicht gesehen"-Listen
+    je Schwelle, nach Nähe absteigend sortiert.
+    """
+    ref = parse_day(latest_date)
+    people = {}
+    for note in sorted(notes.values(), key=lambda n: n["name"]):
+        days = contacts.get(note["name"], {})
+        last = max(days) if days else None
+        last_day = parse_day(last)
+        since = (ref - last_day).days if ref and last_day else None
+        people[note["name"]] = {
+            "group": note["group"],
+            "closeness": note["closeness"],
+            "interactions": sum(days.values()),
+            "contact_days": len(days),
+            "last_contact": last,
+            "days_since": since,
+        }
+
+    not_seen = {}
+    for threshold in NOT_SEEN_DAYS:
+        names = [name for name, p in people.items() if p["days_since"] is None or p["days_since"] >= threshold]
+        names.sort(key=lambda name: -people[name]["closeness"])
+        not_seen[f"{threshold}d"] = names
+    return {"people": people, "not_seen": not_seen}
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# rpg_prefix.py
+# Ziel: Kumulative Präfix-Arrays über die Journal-Teil-Aggregate, damit Stände "zum Datum X" und
+#       Deltas zwischen zwei Daten per Binärsuche + Subtraktion statt per Rescan entstehen
+
+import os, json
+
+from rpg_manifest import manifest_digest
+from bisect import bisect_left, bisect_right
+
+PREFIX_PATH = '08_System/rpg_prefix_v5.json'
+PREFIX_VERSION = 1
+# Summierbare Felder eines Teil-Aggregats (Präfixsumme; Index 0 = vor der ersten Datei)
+SUM_FIELDS = ("xp", "tasks", "minutes", "run_km", "run_min")
+
+
+def build_prefix(partials, skill_categories):
+    """
+    Baut die Präfix-Arrays aus [(datum, partial)] in Dateireihenfolge. Die Summen werden in derselben
+    Reihenfolge gebildet wie in reduce_partials, der letzte Eintrag ist also exakt der Gesamtstand.
+    SallyUp ist nicht subtrahierbar und wird als laufendes Maximum geführt.
+    """
+    categories = list(skill_categories)
+    cat_index = {cat: i for i, cat in enumerate(categories)}
+
+    sums = {field: [0.0] for field in SUM_FIELDS}
+    skill = [[0.0] for _ in categories]
+    sallyup_best = [0.0]
+    goals = []        # [zielname, regel-tag, index der ersten Datei]
+    goal_cum = []
+    goal_index = {}
+    for k, (_, part) in enumerate(partials):
+        for field in SUM_FIELDS:
+            col = sums[field]
+            col.append(col[-1] + part[field])
+        day_skill = [0.0] * len(categories)
+        for cat, xp in part["skill_xp"].items():
+            # wie reduce_partials: Kategorien außerhalb der Tabelle zählen nicht
+            if cat in cat_index:
+                day_skill[cat_index[cat]] += xp
+        for i, col in enumerate(skill):
+            col.append(col[-1] + day_skill[i])
+        sallyup_best.append(max(sallyup_best[-1], part["sallyup_best"]))
+        for col in goal_cum:
+            col.append(col[-1])
+        for goal_name, tag, count in part["goals"]:
+            if goal_name not in goal_index:
+                goal_index[goal_name] = len(goals)
+                goals.append([goal_name, tag, k])
+                goal_cum.append([0.0] * (k + 2))
+            goal_cum[goal_index[goal_name]][-1] += count
+
+    return {
+        "version": PREFIX_VERSION,
+        "keys": [d_str for d_str, _ in partials],
+        "categories": categories,
+        **sums,
+        "skill_xp": skill,
+        "sallyup_best": sallyup_best,
+        "goals": goals,
+        "goal_cum": goal_cum,
+    }
+
+
+def save_prefix(vault_path, prefix):
+    prefix_file = os.path.join(vault_path, PREFIX_PATH)
+    os.makedirs(os.path.dirname(prefix_file), exist_ok=True)
+    payload = json.dumps(prefix, ensure_ascii=False, separators=(",", ":"))
+    with open(prefix_file, "w", encoding="utf-8") as f:
+        f.write(payload)
+
+
+def load_prefix(vault_path):
+    prefix_file = os.path.join(vault_path, PREFIX_PATH)
+    try:
+        with open(prefix_file, "r", encoding="utf-8") as f:
+            prefix = json.load(f)
+    except (IOError, ValueError):
+        return None
+    return prefix if prefix.get("version") == PREFIX_VERSION else None
+
+
+def update_prefix(vault_path, partials, changed_paths, skill_categories, full=False, manifest_key=None):
+    """
+    Baut die Präfix-Arrays neu, wenn sich Journale geändert haben, das Manifest neu geschrieben wird oder die Datei
+    fehlt. Gestempelt wird mit dem Hash des Manifests (`manifest_key` = Hash des gleich zu schreibenden Manifests,
+    sonst des gespeicherten), damit Leser erkennen, ob die Arrays zum letzten Sync passen (is_current_prefix).
+    Gibt True bei Neuaufbau zurück.
+    """
+    if (not changed_paths and not full and manifest_key is None
+            and os.path.exists(os.path.join(vault_path, PREFIX_PATH))):
+        return False
+    prefix = build_prefix(partials, skill_categories)
+    prefix["manifest"] = manifest_key if manifest_key is not None else manifest_digest(vault_path)
+    save_prefix(vault_path, prefix)
+    return True
+
+
+def is_current_prefix(vault_path, prefix):
+    """ True, wenn `prefix` zum gespeicherten Manifest gehört (kein abgebrochener Sync dazwischen). """
+    digest = manifest_digest(vault_path)
+    return prefix is not None and digest is not None and prefix.get("manifest") == digest
+
+
+def _days(prefix):
+    # Datumsteil der Schlüssel (Dateinamen können nach dem Datum weitergehen), einmal je geladener Datei
+    if "_days" not in prefix:
+        prefix["_days"] = [k[:10] for k in prefix["keys"]]
+    return prefix["_days"]
+
+
+def _position(prefix, day):
+    """ Anzahl der Dateien mit Datum <= day (Binärsuche über die Datumsschlüssel). """
+    return bisect_right(_days(prefix), day)
+
+
+def _window(prefix, lo, hi):
+    """ Summen der Dateien [lo, hi) als Differenz zweier Präfix-Einträge. """
+    return {
+        "xp": prefix["xp"][hi] - prefix["xp"][lo],
+        "tasks": int(round(prefix["tasks"][hi] - prefix["tasks"][lo])),
+        "minutes": prefix["minutes"][hi] - prefix["minutes"][lo],
+        "run_km": prefix["run_km"][hi] - prefix["run_km"][lo],
+        "run_min": prefix["run_min"][hi] - prefix["run_min"][lo],
+        "skill_xp": {cat: col[hi] - col[lo] for cat, col in zip(prefix["categories"], prefix["skill_xp"])},
+        "goals": {name: cum[hi] - cum[lo] for (name, _, first), cum in zip(prefix["goals"], prefix["goal_cum"])
+                  if first < hi},
+    }
+
+
+def totals_as_of(prefix, day, goal_rules):
+    """
+    Gesamtwerte wie reduce_partials, aber nur über die Journale bis einschließlich `day`.
+    "Heute" ist der letzte Journaltag <= day. completed_today fehlt (steht nicht in den Präfix-Arrays).
+    """
+    k = _position(prefix, day)
+    total = _window(prefix, 0, k)
+    latest_date = prefix["keys"][k - 1] if k else None
+    lo = bisect_left(_days(prefix), latest_date[:10]) if latest_date else k
+    today = _window(prefix, lo, k)
+
+    goal_progress = {}
+    for (name, tag, first), cum in zip(prefix["goals"], prefix["goal_cum"]):
+        if first < k:
+            goal = goal_rules.get(tag, {})
+            goal_progress[name] = {
+                "title": name,
+                "current": cum[k],
+                "target": goal.get("target"),
+                "unit": "Lektionen",
+                "end_date": goal.get("end_date")
+            }
+    return {
+        "total_xp": total["xp"],
+        "skill_xp": total["skill_xp"],
+        "run_total_km": total["run_km"],
+        "run_total_min": total["run_min"],
+        "sallyup_best_min": prefix["sallyup_best"][k],
+        "goal_progress": goal_progress,
+        "latest_date": latest_date,
+        "latest_daily_stats": {
+            "total_xp_today": round(today["xp"], 2),
+            "tasks_today": today["tasks"],
+            "minutes_today": round(today["minutes"], 2),
+            "daily_breakdown": {cat: round(xp, 2) for cat, xp in today["skill_xp"].items()}
+        }
+    }
+
+
+def range_delta(prefix, since, until):
+    """ Zuwachs zwischen zwei Daten (beide einschließlich); `since` None = seit Beginn. """
+    lo = bisect_left(_days(prefix), since) if since else 0
+    hi = _position(prefix, until)
+    delta = _window(prefix, lo, max(lo, hi))
+    best = prefix["sallyup_best"]
+    return {
+        "from": since,
+        "to": until,
+        "files": max(hi - lo, 0),
+        "total_xp": round(delta["xp"], 2),
+        "skill_xp_gained": {cat: round(xp, 2) for cat, xp in delta["skill_xp"].items()},
+        "tasks": delta["tasks"],
+        "minutes": round(delta["minutes"], 1),
+        "run_metrics": {"total_km": round(delta["run_km"], 2), "total_minutes": round(delta["run_min"], 1)},
+        # Präfix-Maximum: nur dann eine neue Bestzeit im Bereich, wenn es im Bereich gestiegen ist
+        "sallyup_new_best": best[hi] if hi > lo and best[hi] > best[lo] else None,
+        "goal_progress": {name: round(v, 2) for name, v in delta["goals"].items() if v},
+    }
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# rpg_profile.py
+# Ziel: --profile-Modus des Syncs: Zeiten und Zähler je Stufe (gelesene Dateien/Bytes, geparste Aufgaben,
+#       Regex-Durchläufe, Cache-Treffer/-Fehlgriffe) als JSON-Bericht in 08_System, dazu die langsamsten
+#       Dateien und optional ein cProfile-Dump
+
+import os, json, time, datetime, cProfile
+
+from rpg_output import atomic_write
+
+PROFILE_PATH = '08_System/rpg_profile_v5.json'
+CPROFILE_PATH = '08_System/rpg_profile_v5.prof'
+SLOWEST_FILES = 20
+# Zähler, die der Bericht über alle Stufen summiert
+TOTAL_KEYS = ("files_read", "bytes_read", "tasks_parsed", "regex_calls", "cache_hits", "cache_misses")
+
+
+def stage_counters(report, stage):
+    """ Zähler-Dict einer Stufe in report["counters"]; None ohne report (dann zählt niemand mit). """
+    if report is None:
+        return None
+    return report.setdefault("counters", {}).setdefault(stage, {})
+
+
+def bump(counters, **values):
+    """ Addiert `values` auf `counters` (no-op für None, damit Aufrufer nicht prüfen müssen). """
+    if counters is None:
+        return
+    for key, value in values.items():
+        counters[key] = counters.get(key, 0) + value
+
+
+def slowest_files(file_times, limit=SLOWEST_FILES):
+    """ [(rel_pfad, sekunden, bytes), ...] -> die `limit` langsamsten als Dicts, langsamste zuerst. """
+    ranked = sorted(file_times, key=lambda item: -item[1])[:limit]
+    return [{"path": rel, "ms": round(seconds * 1000, 3), "bytes": size} for rel, seconds, size in ranked]
+
+
+def build_profile(report, total_seconds, full=False, jobs=1, limit=SLOWEST_FILES):
+    """
+    Bericht aus `report` (run_sync/write_outputs): je Stufe Dauer, Anteil an der Gesamtzeit und Zähler,
+    dazu Summen der TOTAL_KEYS über alle Stufen und die langsamsten Dateien (Lesen + Zerlegen).
+    """
+    timings = report.get("timings", {})
+    counters = report.get("counters", {})
+    stages = {}
+    for name in list(timings) + [n for n in counters if n not in timings]:
+        seconds = timings.get(name, 0.0)
+        stages[name] = {"ms": round(seconds * 1000, 3),
+                        "share": round(seconds / total_seconds, 4) if total_seconds else 0.0,
+                        **counters.get(name, {})}
+    totals = {key: sum(c.get(key, 0) for c in counters.values()) for key in TOTAL_KEYS}
+    return {
+        "generated": datetime.datetime.now().isoformat(timespec="seconds"),
+        "mode": "full" if full else "incremental",
+        "jobs": jobs,
+        "total_ms": round(total_seconds * 1000, 3),
+        "stages": stages,
+        "totals": totals,
+        "slowest_files": slowest_files(report.get("file_times", []), limit),
+        "written": report.get("written", []),
+    }
+
+
+def write_profile(vault_path, profile):
+    atomic_write(os.path.join(vault_path, PROFILE_PATH),
+                 json.dumps(profile, indent=2, ensure_ascii=False).encode("utf-8"))
+
+
+def print_profile(profile):
+    print(f"--- Profil ({profile['total_ms']:.0f} ms) ---")
+    for name, stage in sorted(profile["stages"].items(), key=lambda kv: -kv[1]["ms"]):
+        extra = ", ".join(f"{k}={v}" for k, v in stage.items() if k not in ("ms", "share"))
+        print(f"  {name:<10} {stage['ms']:>9.1f} ms  {stage['share'] * 100:5.1f}%  {extra}")
+    print("  Summen: " + ", ".join(f"{k}={v}" for k, v in profile["totals"].items()))
+    for entry in profile["slowest_files"][:5]:
+        print(f"  langsam: {entry['path']} ({entry['ms']:.2f} ms, {entry['bytes']} B)")
+    print(f"Bericht: {PROFILE_PATH}")
+
+
+def profile_sync(vault_path, sync, full=False, jobs=1, use_cprofile=False, limit=SLOWEST_FILES):
+    """
+    Führt `sync(report)` (z.B. scan_vault) mit Profil-Zählern aus, schreibt den Bericht nach PROFILE_PATH und
+    mit `use_cprofile` zusätzlich einen cProfile-Dump nach CPROFILE_PATH (auswerten mit `python -m pstats`).
+    Worker-Prozesse von --jobs erfasst cProfile nicht; ihre Zähler und Dateizeiten kommen über die Ergebnisse.
+    """
+    report = {"file_times": []}   # "file_times" schaltet die Zeitmessung je Datei ein
+    profiler = cProfile.Profile() if use_cprofile else None
+    started = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        result = sync(report)
+    finally:
+        if profiler:
+            profiler.disable()
+    profile = build_profile(report, time.perf_counter() - started, full, jobs, limit)
+    if profiler:
+        profiler.dump_stats(os.path.join(vault_path, CPROFILE_PATH))
+        profile["cprofile"] = CPROFILE_PATH
+    write_profile(vault_path, profile)
+    print_profile(profile)
+    if profiler:
+        print(f"cProfile: {CPROFILE_PATH}")
+    return result, profile
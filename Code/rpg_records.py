@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# rpg_records.py
+# Ziel: Persönliche Rekorde für alle Tags mit Modus "Metrik" aus XP_Calculation.md
+#       (Summe, Bestwert mit Datum, Rekord-Verlauf, Top-k über einen begrenzten Heap)
+
+import heapq
+
+RECORDS_TOP_K = 5
+# Metrik-Spalte der Regeltabelle -> Task-Spalte, Einheit und Richtung des Bestwerts.
+# Eine neue Metrik für einen Tag ist nur ein Eintrag in der Tabelle; neue Metrik-Arten kommen hier dazu.
+METRIC_SPECS = {
+    "km": {"field": "km", "unit": "km", "better": "max"},
+    "best_time": {"field": "time", "unit": "min", "better": "max"},   # z.B. SallyUp: länger halten ist besser
+    "min_time": {"field": "time", "unit": "min", "better": "min"},    # z.B. Wettkampfzeit: schneller ist besser
+    "minutes": {"field": "minutes", "unit": "min", "better": "max"},
+}
+
+
+def metric_tags(tag_rules):
+    """ {tag: spec} aller Metrik-Tags in Tabellen-Reihenfolge (unbekannte Metriken werden ignoriert). """
+    result = {}
+    for tag, rule in tag_rules.items():
+        if (rule.get("mode") or "").lower() == "metrik":
+            metric = (rule.get("metric") or "").lower()
+            if metric in METRIC_SPECS:
+                result[tag] = dict(METRIC_SPECS[metric], metric=metric)
+    return result
+
+
+def metric_fields(tag_matcher):
+    """ Task-Spalte je Tag-Index des Matchers (None = keine Metrik); für die Bewertungsschleife. """
+    specs = metric_tags(dict(zip(tag_matcher.tags, tag_matcher.rules)))
+    return [specs[tag]["field"] if tag in specs else None for tag in tag_matcher.tags]
+
+
+def reduce_records(partials, tag_rules, top_k=RECORDS_TOP_K):
+    """
+    Faltet die Metrik-Werte der Teil-Aggregate (partial["metrics"] = {tag: [werte]}) in Dateireihenfolge.
+    Bei gleichem Wert zählt der frühere Eintrag (Rekord-Datum und Top-k bleiben stabil).
+    """
+    specs = metric_tags(tag_rules)
+    state = {tag: {"sum": 0.0, "count": 0, "best": None, "best_date": None, "progression": [], "heap": []}
+             for tag in specs}
+    seq = 0
+    for d_str, part in partials:
+        for tag, values in part["metrics"].items():
+            rec = state.get(tag)
+            if rec is None:
+                continue
+            sign = 1.0 if specs[tag]["better"] == "max" else -1.0
+            for value in values:
+                seq += 1
+                rec["sum"] += value
+                rec["count"] += 1
+                if rec["best"] is None or sign * value > sign * rec["best"]:
+                    rec["best"], rec["best_date"] = value, d_str
+                    rec["progression"].append([d_str, value])
+                # Min-Heap der Größe k über (Güte, -Reihenfolge): verdrängt wird der schlechteste bzw. neuere
+                item = (sign * value, -seq, value, d_str)
+                if len(rec["heap"]) < top_k:
+                    heapq.heappush(rec["heap"], item)
+                elif item > rec["heap"][0]:
+                    heapq.heapreplace(rec["heap"], item)
+
+    records = {}
+    for tag, spec in specs.items():
+        rec = state[tag]
+        records[tag] = {
+            "metric": spec["metric"],
+            "unit": spec["unit"],
+            "count": rec["count"],
+            "sum": round(rec["sum"], 2),
+            "best": rec["best"],
+            "best_date": rec["best_date"],
+            "progression": rec["progression"],
+            "top": [{"value": value, "date": d_str} for _, _, value, d_str in sorted(rec["heap"], reverse=True)],
+        }
+    return records
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# rpg_rollups.py
+# Ziel: Tages-, Wochen-, Monats- und Jahres-Rollups (XP je Kategorie, Minuten, Aufgaben, Lauf-km)
+#       als kompakte Zeitreihen-Datei neben life_rpg_data_v5.json, inkrementell gepflegt
+
+import os, json, datetime
+
+SERIES_PATH = '08_System/life_rpg_series_v5.json'
+SERIES_VERSION = 1
+LEVELS = ("day", "week", "month", "year")
+# Zeile je Zeitraum: [XP je Kategorie..., Minuten, Aufgaben, Lauf-km]
+EXTRA_FIELDS = ("minutes", "tasks", "run_km")
+
+
+def period_key(level, day):
+    """ Schlüssel des Zeitraums, in den ein Tag ("YYYY-MM-DD") fällt; Wochen nach ISO ("2026-W05"). """
+    if level == "day":
+        return day
+    if level == "month":
+        return day[:7]
+    if level == "year":
+        return day[:4]
+    iso_year, iso_week, _ = parse_day(day).isocalendar()
+    return f"{iso_year}-W{iso_week:02d}"
+
+
+def day_of(rel_path):
+    # Journal-Dateien heißen "YYYY-MM-DD....md"
+    return os.path.basename(rel_path)[:10]
+
+
+def parse_day(day):
+    """
+    Datum eines Tages-Schlüssels ("YYYY-MM-DD", weitere Zeichen werden ignoriert) oder None.
+    Dateinamen wie "2026-02-30.md" passen auf das Datumsmuster, sind aber kein Kalendertag; datumsbasierte
+    Auswertungen überspringen sie.
+    """
+    if not day:
+        return None
+    try:
+        return datetime.date.fromisoformat(day[:10])
+    except ValueError:
+        return None
+
+
+def _day_row(partials, cat_index):
+    row = [0.0] * (len(cat_index) + len(EXTRA_FIELDS))
+    n = len(cat_index)
+    for partial in partials:
+        for cat, xp in partial["skill_xp"].items():
+            row[cat_index[cat]] += xp
+        row[n] += partial["minutes"]
+        row[n + 1] += partial["tasks"]
+        row[n + 2] += partial["run_km"]
+    # Tageswerte gerundet speichern: Perioden summieren immer die gespeicherten Tage,
+    # dadurch sind inkrementelle und volle Läufe identisch
+    return [round(v, 2) for v in row]
+
+
+def _sum_rows(rows, width):
+    total = [0.0] * width
+    for row in rows:
+        for i, v in enumerate(row):
+            total[i] += v
+    return [round(v, 2) for v in total]
+
+
+def load_series(vault_path):
+    """ Lädt die gespeicherten Rollups als {"categories": [...], "day": {tag: zeile}, ...} oder None. """
+    series_file = os.path.join(vault_path, SERIES_PATH)
+    try:
+        with open(series_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (IOError, ValueError):
+        return None
+    if data.get("version") != SERIES_VERSION:
+        return None
+    categories = data["categories"]
+    series = {"categories": categories}
+    for level in LEVELS:
+        cols = data[level]
+        skill_rows = cols["skill_xp"]
+        series[level] = {
+            key: skill_rows[i] + [cols[field][i] for field in EXTRA_FIELDS]
+            for i, key in enumerate(cols["keys"])
+        }
+    return series
+
+
+def save_series(vault_path, series):
+    """ Spaltenformat je Ebene (keys, xp, skill_xp, minutes, tasks, run_km), direkt für Diagramme nutzbar. """
+    n = len(series["categories"])
+    data = {"version": SERIES_VERSION, "categories": series["categories"]}
+    for level in LEVELS:
+        keys = sorted(series[level])
+        rows = [series[level][k] for k in keys]
+        data[level] = {
+            "keys": keys,
+            "xp": [round(sum(r[:n]), 2) for r in rows],
+            "skill_xp": [r[:n] for r in rows],
+        }
+        for i, field in enumerate(EXTRA_FIELDS):
+            data[level][field] = [int(r[n + i]) if field == "tasks" else r[n + i] for r in rows]
+    series_file = os.path.join(vault_path, SERIES_PATH)
+    os.makedirs(os.path.dirname(series_file), exist_ok=True)
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    with open(series_file, "w", encoding="utf-8") as f:
+        f.write(payload)
+
+
+def update_rollups(vault_path, partials, changed_paths, categories, full=False):
+    """
+    Aktualisiert die Rollups aus den Teil-Aggregaten ([(datum, partial)] in Dateireihenfolge).
+    Neu berechnet werden nur die Tage der geänderten Pfade und die Wochen/Monate/Jahre, in die sie fallen;
+    fehlt die Datei oder haben sich die Kategorien geändert, wird alles neu aufgebaut.
+    Gibt die Anzahl der neu berechneten Tage zurück (0 = Datei unverändert).
+    """
+    if not changed_paths and not full and os.path.exists(os.path.join(vault_path, SERIES_PATH)):
+        # Neue Kategorien gibt es nur mit neuen Regeln, dann sind auch Pfade geändert
+        return 0
+    categories = list(categories)
+    for _, partial in partials:
+        # Kategorien außerhalb der Regeltabelle (z.B. der Fallback "Allgemein") hängen hinten an
+        for cat in partial["skill_xp"]:
+            if cat not in categories:
+                categories.append(cat)
+
+    series = None if full else load_series(vault_path)
+    if series is None or series["categories"] != categories:
+        series = {"categories": categories, **{level: {} for level in LEVELS}}
+        touched = {d_str[:10] for d_str, _ in partials}
+    else:
+        touched = {day_of(p) for p in changed_paths}
+    # Ungültige Tage (z.B. 2026-02-30) haben keine Woche und fehlen in allen Rollups
+    touched = {day for day in touched if parse_day(day)}
+    if not touched:
+        return 0
+
+    by_day = {}
+    for d_str, partial in partials:
+        day = d_str[:10]
+        if day in touched:
+            by_day.setdefault(day, []).append(partial)
+    cat_index = {cat: i for i, cat in enumerate(categories)}
+    days = series["day"]
+    for day in touched:
+        if day in by_day:
+            days[day] = _day_row(by_day[day], cat_index)
+        else:
+            days.pop(day, None)
+
+    width = len(categories) + len(EXTRA_FIELDS)
+    for level in LEVELS[1:]:
+        periods = {period_key(level, day) for day in touched}
+        members = {}
+        # Sortiert summieren, damit die Reihenfolge der Additionen nicht vom Verlauf abhängt
+        for day, row in sorted(days.items()):
+            key = period_key(level, day)
+            if key in periods:
+                members.setdefault(key, []).append(row)
+        for key in periods:
+            if key in members:
+                series[level][key] = _sum_rows(members[key], width)
+            else:
+                series[level].pop(key, None)
+
+    save_series(vault_path, series)
+    return len(touched)
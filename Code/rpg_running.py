@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# rpg_running.py
+# Ziel: Lauf-Analyse für #run aus den Teil-Aggregaten: Pace je Lauf, gleitende 7/28/90-Tage-Fenster
+#       über Präfixsummen eines Tages-Arrays (O(1) je Fenster), Acute:Chronic-Load, längster/schnellster Lauf
+
+import datetime
+
+from rpg_rollups import parse_day
+
+WINDOWS = (7, 28, 90)
+ACUTE_DAYS, CHRONIC_DAYS = 7, 28
+RECENT_RUNS = 10
+SERIES_DAYS = 90
+FASTEST_MIN_KM = 1.0  # kürzere Läufe verzerren die Bestpace
+MIN_PLAUSIBLE_PACE = 2.0  # min/km; schneller ist ein Tippfehler in Dauer oder Distanz
+
+
+def _pace(km, minutes):
+    return round(minutes / km, 2) if km > 0 and minutes > 0 else None
+
+
+def run_analytics(partials):
+    """
+    Baut aus partial["runs"] ([[km, minuten], ...] je #run-Aufgabe) ein Tages-Array ab dem ersten Lauftag
+    und Präfixsummen darüber. Bezugstag aller Fenster ist der letzte Journaltag.
+    """
+    # Journale mit ungültigem Datum (z.B. 2026-02-30) haben keinen Platz im Tages-Array
+    valid = [(d_str[:10], part) for d_str, part in partials if parse_day(d_str)]
+    runs = []
+    for day, part in valid:
+        for km, minutes in part["runs"]:
+            runs.append((day, km, minutes))
+    latest = valid[-1][0] if valid else None
+    if not runs or latest is None:
+        return {"runs": 0}
+
+    first_day = parse_day(runs[0][0])
+    last_day = parse_day(latest)
+    n_days = max((last_day - first_day).days + 1, 1)
+    day_km = [0.0] * n_days
+    day_min = [0.0] * n_days
+    for d_str, km, minutes in runs:
+        offset = (parse_day(d_str) - first_day).days
+        if 0 <= offset < n_days:
+            day_km[offset] += km
+            day_min[offset] += minutes
+
+    # Präfixsummen: Summe der Tage [a, b) = pre[b] - pre[a]
+    pre_km, pre_min = [0.0], [0.0]
+    for km, minutes in zip(day_km, day_min):
+        pre_km.append(pre_km[-1] + km)
+        pre_min.append(pre_min[-1] + minutes)
+
+    def window(days, end=n_days):
+        start = max(end - days, 0)
+        return pre_km[end] - pre_km[start], pre_min[end] - pre_min[start]
+
+    windows = {}
+    for days in WINDOWS:
+        km, minutes = window(days)
+        windows[f"{days}d"] = {"km": round(km, 2), "minutes": round(minutes, 1), "pace": _pace(km, minutes)}
+
+    def acwr(pre):
+        # Acute:Chronic: 7-Tage-Last gegen den Wochenschnitt der letzten 28 Tage
+        acute = pre[n_days] - pre[max(n_days - ACUTE_DAYS, 0)]
+        chronic = (pre[n_days] - pre[max(n_days - CHRONIC_DAYS, 0)]) / (CHRONIC_DAYS / ACUTE_DAYS)
+        return round(acute / chronic, 2) if chronic > 0 else None
+
+    longest = max(runs, key=lambda r: r[1])
+    paced = [r for r in runs if r[1] >= FASTEST_MIN_KM and r[2] / r[1] >= MIN_PLAUSIBLE_PACE]
+    fastest = min(paced, key=lambda r: r[2] / r[1]) if paced else None
+    total_km = pre_km[n_days]
+    total_min = pre_min[n_days]
+
+    series_start = max(n_days - SERIES_DAYS, 0)
+    return {
+        "runs": len(runs),
+        "reference_date": latest,
+        "avg_pace": _pace(total_km, total_min),
+        "windows": windows,
+        "acwr": {"km": acwr(pre_km), "minutes": acwr(pre_min)},
+        "longest_run": {"date": longest[0], "km": longest[1], "minutes": round(longest[2], 2),
+                        "pace": _pace(longest[1], longest[2])},
+        "fastest_run": {"date": fastest[0], "km": fastest[1], "minutes": round(fastest[2], 2),
+                        "pace": _pace(fastest[1], fastest[2])} if fastest else None,
+        "recent_runs": [{"date": d, "km": km, "minutes": round(m, 2), "pace": _pace(km, m)}
+                        for d, km, m in runs[-RECENT_RUNS:]],
+        # Gleitende 7/28-Tage-km für die letzten SERIES_DAYS Tage (je Punkt eine Subtraktion)
+        "rolling": {
+            "start": (first_day + datetime.timedelta(days=series_start)).isoformat(),
+            "km_7d": [round(window(7, end)[0], 2) for end in range(series_start + 1, n_days + 1)],
+            "km_28d": [round(window(28, end)[0], 2) for end in range(series_start + 1, n_days + 1)],
+        },
+    }
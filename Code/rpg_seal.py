@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# rpg_seal.py
+# Ziel: Abgeschlossene Monatsordner (07_Journal/YYYY-MM) versiegeln: ihre Manifest-Einträge (Task-Spalten und
+#       Teil-Aggregate) werden mit einem Ordner-Fingerprint abgelegt, spätere Scans prüfen nur den Fingerprint
+#       (ein scandir, kein read, kein Parsen)
+
+import os, re, json, datetime
+
+from rpg_manifest import content_hash
+
+SEAL_PATH = '08_System/rpg_sealed_v5.json'
+SEAL_VERSION = 3
+SEAL_AFTER_DAYS = 7   # Nachtragen am Monatsanfang: ein Monat gilt erst 7 Tage nach Monatsende als abgeschlossen
+MONTH_DIR_RE = re.compile(r'\d{4}-\d{2}')
+
+
+def load_seals(vault_path, rules_key, tags_key):
+    """
+    Lädt die Siegel {monat: {"fingerprint": month_fingerprint, "files": [[datum, rel_pfad, manifest_eintrag], ...]}}
+    und liefert (seals, rules_match, tags_match) wie load_manifest: Siegel hängen nur vom Inhalt ab; bei geänderten
+    Regeln bleiben die Task-Spalten gültig und nur die Teil-Aggregate müssen neu bewertet werden.
+    """
+    seal_file = os.path.join(vault_path, SEAL_PATH)
+    try:
+        with open(seal_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (IOError, ValueError):
+        return {}, True, True
+    if data.get("version") != SEAL_VERSION:
+        return {}, True, True
+    return data.get("months", {}), data.get("rules_key") == rules_key, data.get("tags_key") == tags_key
+
+
+def save_seals(vault_path, rules_key, tags_key, seals):
+    seal_file = os.path.join(vault_path, SEAL_PATH)
+    os.makedirs(os.path.dirname(seal_file), exist_ok=True)
+    data = {"version": SEAL_VERSION, "rules_key": rules_key, "tags_key": tags_key, "months": seals}
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    with open(seal_file, "w", encoding="utf-8") as f:
+        f.write(payload)
+
+
+def month_fingerprint(month_dir):
+    """
+    Hash über die sortierten (Name, mtime_ns, Größe) aller Einträge eines Monatsordners aus einem scandir.
+    Anders als die mtime des Ordners ändert er sich auch, wenn eine Notiz an Ort und Stelle bearbeitet wird.
+    None, wenn der Ordner nicht lesbar ist.
+    """
+    entries = []
+    try:
+        with os.scandir(month_dir) as it:
+            for e in it:
+                if not e.name.startswith("."):
+                    st = e.stat()
+                    entries.append((e.name, st.st_mtime_ns, st.st_size))
+    except OSError:
+        return None
+    entries.sort()
+    return content_hash(json.dumps(entries).encode("utf-8"))
+
+
+def month_closed(month, today=None):
+    """ True, wenn SEAL_AFTER_DAYS seit dem Ende des Monats ("YYYY-MM") vergangen sind. """
+    today = today or datetime.date.today()
+    year, mon = int(month[:4]), int(month[5:7])
+    next_month = datetime.date(year + mon // 12, mon % 12 + 1, 1)
+    return (today - next_month).days >= SEAL_AFTER_DAYS
+
+
+def month_of(rel_path, journal_dir_name):
+    """ Monatsordner eines relativen Journal-Pfads ("07_Journal/2026-01/2026-01-05.md" -> "2026-01") oder None. """
+    parts = rel_path.split("/")
+    if len(parts) >= 3 and parts[0] == journal_dir_name and MONTH_DIR_RE.fullmatch(parts[1]):
+        return parts[1]
+    return None
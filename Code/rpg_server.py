@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# rpg_server.py
+# Ziel: Lokaler Dashboard-Server (nur Standardbibliothek): liefert Dashboard und JSON-Shards aus dem Speicher
+#       mit ETag/If-None-Match, synchronisiert im Watch-Modus und meldet neue Daten per Server-Sent Events;
+#       /patches?since=v liefert nur die JSON-Patches seit Version v (rpg_patch)
+
+import os, json, time, argparse, threading, urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from obsidian_rpg_sync_v5 import scan_vault, JSON_CACHE_PATH, HTML_DASHBOARD_PATH
+from rpg_manifest import content_hash
+from rpg_patch import patches_since
+from rpg_rollups import SERIES_PATH
+from rpg_shards import shard_payloads, shard_path, load_patch_log
+from rpg_watch import watch, DEBOUNCE_SECONDS
+
+DEFAULT_PORT = 8765
+HEARTBEAT_SECONDS = 15   # SSE-Kommentar gegen Proxy-/Browser-Timeouts
+MAX_CHANGES = 64         # gemerkte Versionen für Clients, die kurz getrennt waren (Last-Event-ID)
+JSON_TYPE = "application/json; charset=utf-8"
+VERSION_HEADER = "X-RPG-Version"  # Patch-Version der ausgelieferten Shards; Basis für /patches?since=
+
+
+class Resource:
+    __slots__ = ("body", "etag", "content_type")
+
+    def __init__(self, body, content_type):
+        self.body = body
+        self.etag = f'"{content_hash(body)}"'
+        self.content_type = content_type
+
+
+def build_resources(vault_path, output):
+    """
+    {name: (url_pfad, Resource)} aus dem Ausgabe-Dict. Shards und der JSON-Cache werden aus `output` serialisiert,
+    Dashboard-HTML und Rollup-Serie einmal je Sync von der Platte gelesen (beide hat der Sync gerade geschrieben).
+    """
+    resources = {}
+    for name, payload in shard_payloads(output).items():
+        resources[name] = ("/" + shard_path(name), Resource(payload.encode("utf-8"), JSON_TYPE))
+    resources["data"] = ("/" + JSON_CACHE_PATH, Resource(json.dumps(output, indent=2).encode("utf-8"), JSON_TYPE))
+    for name, rel_path, content_type in (("dashboard", HTML_DASHBOARD_PATH, "text/html; charset=utf-8"),
+                                         ("series", SERIES_PATH, JSON_TYPE)):
+        try:
+            with open(os.path.join(vault_path, rel_path), "rb") as f:
+                resources[name] = ("/" + rel_path, Resource(f.read(), content_type))
+        except IOError:
+            continue
+    return resources
+
+
+class DashboardState:
+    """
+    Aktueller Stand aller Ressourcen im Speicher plus Versionszähler für SSE-Clients. `patch_log` ist das beim
+    selben Sync geschriebene Patch-Protokoll; Shards und Protokoll werden zusammen getauscht, damit die
+    Patch-Version immer zu den ausgelieferten Shards passt. SSE-Event-IDs tragen ein Token je Serverstart
+    ("token:version"), damit eine Last-Event-ID von vor einem Neustart nicht als gültige Version gilt.
+    """
+
+    def __init__(self, vault_path):
+        self.vault_path = vault_path
+        self.routes = {}     # url_pfad -> Resource
+        self.etags = {}      # name -> etag
+        self.instance = os.urandom(4).hex()
+        self.version = 0
+        self.changes = []    # [(version, [namen]), ...]
+        self.patch_log = {"version": 0, "patches": []}
+        self.cond = threading.Condition()
+
+    def publish(self, output):
+        """ Übernimmt das Ergebnis eines Syncs; gibt die Namen der geänderten Ressourcen zurück. """
+        resources = build_resources(self.vault_path, output)
+        routes = {path: res for path, res in resources.values()}
+        routes["/"] = routes.get("/" + HTML_DASHBOARD_PATH)
+        etags = {name: res.etag for name, (_, res) in resources.items()}
+        patch_log = load_patch_log(self.vault_path) or self.patch_log
+        with self.cond:
+            changed = sorted(name for name in etags.keys() | self.etags.keys() if etags.get(name) != self.etags.get(name))
+            self.routes, self.etags, self.patch_log = routes, etags, patch_log
+            if changed:
+                self.version += 1
+                self.changes.append((self.version, changed))
+                del self.changes[:-MAX_CHANGES]
+                self.cond.notify_all()
+        return changed
+
+    def get(self, path):
+        """ (Resource, Patch-Version) unter einer Sperre, damit beide zum selben Sync gehören. """
+        with self.cond:
+            return self.routes.get(path), self.patch_log["version"]
+
+    def patches(self, since):
+        with self.cond:
+            return patches_since(self.patch_log, since)
+
+    def event_id(self, version):
+        return f"{self.instance}:{version}"
+
+    def parse_event_id(self, event_id):
+        """ Version aus einer Last-Event-ID dieses Serverstarts; None bei fremder oder ungültiger ID. """
+        instance, _, version = event_id.partition(":")
+        if instance != self.instance or not version.isdigit():
+            return None
+        return int(version)
+
+    def wait_for_changes(self, since, timeout):
+        """
+        Wartet auf eine Version > `since`; liefert (version, geänderte namen seit `since`).
+        `since` None oder größer als die aktuelle Version (Client von vor einem Neustart): sofortiger Reset,
+        alle Ressourcen gelten als geändert.
+        """
+        with self.cond:
+            if since is None or since > self.version:
+                return self.version, sorted(self.etags)
+            self.cond.wait_for(lambda: self.version > since, timeout)
+            if self.version <= since:
+                return since, []
+            if not self.changes or self.changes[0][0] > since + 1:
+                # Zu lange getrennt: alles gilt als geändert
+                return self.version, sorted(self.etags)
+            names = set()
+            for version, changed in self.changes:
+                if version > since:
+                    names.update(changed)
+            return self.version, sorted(names)
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    server_version = "LifeRPG/5"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        path = urllib.parse.unquote(url.path)
+        if path == "/events":
+            self._stream_events()
+            return
+        if path == "/patches":
+            self._send_patches(urllib.parse.parse_qs(url.query))
+            return
+        res, patch_version = self.server.state.get(path)
+        if res is None:
+            self.send_error(404)
+            return
+        if self._etag_matches(res.etag):
+            self.send_response(304)
+            self.send_header("ETag", res.etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header(VERSION_HEADER, str(patch_version))
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", res.content_type)
+        self.send_header("Content-Length", str(len(res.body)))
+        self.send_header("ETag", res.etag)
+        self.send_header(VERSION_HEADER, str(patch_version))
+        # no-cache: der Browser darf speichern, muss aber per If-None-Match nachfragen
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(res.body)
+
+    def _send_patches(self, query):
+        try:
+            since = int(query.get("since", [""])[0])
+        except ValueError:
+            self.send_error(400, "since muss eine Versionsnummer sein")
+            return
+        body = json.dumps(self.server.state.patches(since), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", JSON_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _etag_matches(self, etag):
+        header = self.headers.get("If-None-Match")
+        if not header:
+            return False
+        candidates = [c.strip() for c in header.split(",")]
+        return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+    def _stream_events(self):
+        state = self.server.state
+        last_event_id = self.headers.get("Last-Event-ID")
+        # Ohne ID (neuer Client) gilt der aktuelle Stand; eine ID von vor einem Neustart erzwingt einen Reset
+        since = state.version if last_event_id is None else state.parse_event_id(last_event_id.strip())
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "keep-alive")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            self.wfile.write(b"retry: 2000\n\n")
+            self.wfile.flush()
+            while not self.server.stopping:
+                version, changed = state.wait_for_changes(since, HEARTBEAT_SECONDS)
+                if version == since:
+                    self.wfile.write(b": ping\n\n")
+                else:
+                    data = json.dumps({"version": version, "changed": changed,
+                                       "patch_version": state.patch_log["version"]})
+                    self.wfile.write(f"id: {state.event_id(version)}\nevent: sync\ndata: {data}\n\n".encode("utf-8"))
+                    since = version
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_request(self, code="-", size="-"):
+        # Nur Fehler ausgeben; jede Shard-Anfrage zu protokollieren wäre zu laut
+        if isinstance(code, int) and code >= 400:
+            super().log_request(code, size)
+
+
+class DashboardServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, state):
+        super().__init__(address, DashboardHandler)
+        self.state = state
+        self.stopping = False
+
+
+def serve(vault_path, host="127.0.0.1", port=DEFAULT_PORT, watch_vault=True, debounce=DEBOUNCE_SECONDS,
+          force_polling=False, jobs=1):
+    """ Startet den Server im Hintergrund; im Vordergrund läuft der Watch-Modus (oder ein einzelner Sync). """
+    state = DashboardState(vault_path)
+    server = DashboardServer((host, port), state)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+
+    def on_sync(output):
+        started = time.perf_counter()
+        changed = state.publish(output)
+        if not thread.is_alive():
+            thread.start()
+            print(f"--- Dashboard: http://{host}:{server.server_address[1]}/ ---")
+        elif changed:
+            print(f"[SERVER] v{state.version}: {', '.join(changed)} ({(time.perf_counter() - started) * 1000:.0f} ms)")
+
+    try:
+        if watch_vault:
+            watch(vault_path, debounce, force_polling, jobs, on_sync=on_sync)
+        else:
+            on_sync(scan_vault(vault_path, jobs=jobs))
+            while True:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stopping = True
+        with state.cond:
+            state.cond.notify_all()
+        server.shutdown()
+        server.server_close()
+        print("--- Dashboard-Server beendet ---")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Life-RPG Dashboard-Server")
+    parser.add_argument("vault_path", nargs="?", default=".")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--no-watch", dest="watch", action="store_false", help="Nur einmal synchronisieren, nicht beobachten")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS, help="Ruhezeit in Sekunden vor dem Sync")
+    parser.add_argument("--poll", action="store_true", help="Polling statt inotify erzwingen")
+    parser.add_argument("--jobs", type=int, default=1)
+    args = parser.parse_args()
+    serve(args.vault_path, args.host, args.port, args.watch, args.debounce, args.poll, args.jobs)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# rpg_shards.py
+# Ziel: Das Ausgabe-Dict in kleine JSON-Shards aufteilen (summary, today, open_tasks, goals, history), damit das
+#       Dashboard nur lädt, was es anzeigt, und nur geänderte Shards geschrieben werden (rpg_output);
+#       jede Änderung wird zusätzlich als JSON-Patch (rpg_patch) ins Patch-Protokoll geschrieben
+
+import os, json
+
+from rpg_output import write_output, is_current, atomic_write
+from rpg_patch import diff, append_patch
+
+SHARD_DIR = '08_System/shards_v5'
+SHARD_NAMES = ("summary", "today", "open_tasks", "goals", "history")
+# Kopfzeile und Skill-Balken; wächst nicht mit der Historie und ist zugleich der eingebettete HTML-Fallback
+SUMMARY_KEYS = ("total_xp", "passive_xp", "skill_xp_gained", "run_metrics", "sallyup_best_time", "last_processed_date")
+TODAY_SUMMARY_KEYS = ("total_xp_today", "tasks_today", "minutes_today")
+HISTORY_KEYS = ("records", "running", "streaks", "people", "mood", "thought_activity", "skills")
+# {"version", "patches": [{"version", "ops"}]}; Pfade der Operationen beginnen mit dem Shard-Namen ("/today/...")
+PATCH_LOG_PATH = f"{SHARD_DIR}/patches.json"
+
+
+def shard_path(name):
+    return f"{SHARD_DIR}/{name}.json"
+
+
+def summary_shard(output):
+    """ Kennzahlen für Kopf und Status-Karten (auch aus einem bereits reduzierten Summary-Dict). """
+    summary = {key: output[key] for key in SUMMARY_KEYS if key in output}
+    today = output.get("latest_daily_stats", output.get("today", {}))
+    summary["today"] = {key: today[key] for key in TODAY_SUMMARY_KEYS if key in today}
+    return summary
+
+
+def split_output(output):
+    """
+    {shard: dict}. Verläufe (Burn-down je Ziel, Rekord-Progression, Serien) liegen nur in "history";
+    "goals" enthält die Ziele ohne burndown.
+    """
+    goals, burndown = [], {}
+    for goal in output.get("goal_progress", []):
+        goals.append({k: v for k, v in goal.items() if k != "burndown"})
+        if "burndown" in goal:
+            burndown[goal["title"]] = goal["burndown"]
+    history = {key: output[key] for key in HISTORY_KEYS if key in output}
+    history["burndown"] = burndown
+    return {
+        "summary": summary_shard(output),
+        "today": output.get("latest_daily_stats", {}),
+        "open_tasks": output.get("open_tasks", {}),
+        "goals": goals,
+        "history": history,
+    }
+
+
+def serialize_shard(shard):
+    return json.dumps(shard, ensure_ascii=False, separators=(",", ":"))
+
+
+def shard_payloads(output):
+    """ {shard: serialisiertes JSON} - identisch für die Dateien und den Server (rpg_server). """
+    return {name: serialize_shard(shard) for name, shard in split_output(output).items()}
+
+
+def load_patch_log(vault_path):
+    try:
+        with open(os.path.join(vault_path, PATCH_LOG_PATH), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return None
+
+
+def _read_shard(vault_path, name):
+    try:
+        with open(os.path.join(vault_path, shard_path(name)), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return None
+
+
+def write_shards(vault_path, output, state):
+    """
+    Schreibt nur die Shards, deren Inhalt sich geändert hat; gibt die geschriebenen relativen Pfade zurück.
+    Vor dem Überschreiben wird der alte Shard von der Platte gelesen und der Unterschied als neue Version ins
+    Patch-Protokoll gehängt (fehlt der alte Shard, ersetzt der Patch ihn als Ganzes).
+    """
+    written, ops = [], []
+    for name, shard in split_output(output).items():
+        rel_path, payload = shard_path(name), serialize_shard(shard)
+        if is_current(vault_path, rel_path, payload, state):
+            continue
+        # Verglichen wird der JSON-Stand (Tupel -> Listen, Zahlen-Schlüssel -> Strings), wie ihn der Client kennt
+        old, new = _read_shard(vault_path, name), json.loads(payload)
+        if old is None:
+            ops.append({"op": "add", "path": f"/{name}", "value": new})
+        else:
+            ops.extend(diff(old, new, f"/{name}"))
+        if write_output(vault_path, rel_path, payload, state):
+            written.append(rel_path)
+    if ops:
+        log = append_patch(load_patch_log(vault_path), ops)
+        atomic_write(os.path.join(vault_path, PATCH_LOG_PATH), serialize_shard(log).encode("utf-8"))
+        written.append(PATCH_LOG_PATH)
+    return written
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# rpg_simulate.py
+# Ziel: What-if-Simulator - bewertet die komplette Task-Historie gegen K alternative XP-Regeltabellen in einem Durchlauf
+
+import os, json, argparse
+
+from obsidian_rpg_sync_v5 import load_rpg_rules, load_task_store, XP_POINTS_MAPPING, BASE_XP_UNIT_MINUTES
+from rpg_tag_matcher import TagMatcher
+from rpg_xp_kernel import np
+
+CHUNK_TASKS = 4096  # begrenzt die Tasks x Tags x Varianten-Zwischenmatrix
+
+
+def build_weight_tables(variants):
+    """
+    Baut aus K Regeltabellen die Tags x K-Matrizen über die Vereinigung aller Tags:
+    Rang (Tabellen-Position für die First-Match-Priorität), Basis_XP, Ziel-Modus und Kategorie-Index.
+    """
+    union = {}
+    for _, (rules, _, _) in variants:
+        for tag in rules:
+            union.setdefault(tag, None)
+    tags = list(union)
+    categories = list(dict.fromkeys(cat for _, (_, cats, _) in variants for cat in cats))
+    cat_index = {cat: i for i, cat in enumerate(categories)}
+
+    missing = len(tags) + 1  # Rang für "Tag fehlt in dieser Variante"
+    rank = [[missing] * len(variants) for _ in tags]
+    base = [[0.0] * len(variants) for _ in tags]
+    ziel = [[False] * len(variants) for _ in tags]
+    cat = [[cat_index["Allgemein"]] * len(variants) for _ in tags]
+    tag_pos = {tag: u for u, tag in enumerate(tags)}
+    for k, (_, (rules, _, _)) in enumerate(variants):
+        for pos, (tag, rule) in enumerate(rules.items()):
+            u = tag_pos[tag]
+            rank[u][k] = pos
+            base[u][k] = rule["base_xp"]
+            ziel[u][k] = rule.get("mode") == "Ziel"
+            cat[u][k] = cat_index[rule["category"]]
+    tables = {"rank": rank, "base": base, "ziel": ziel, "cat": cat, "missing": missing,
+              "n_var": len(variants), "fallback_cat": cat_index["Allgemein"]}
+    return tags, categories, tables
+
+
+def _simulate_numpy(matched, points_xp, minutes, tables, n_cats):
+    n_var = tables["n_var"]
+    rank = np.asarray(tables["rank"], dtype=np.int64).reshape(-1, n_var)
+    base = np.asarray(tables["base"], dtype=np.float64).reshape(-1, n_var)
+    ziel = np.asarray(tables["ziel"], dtype=bool).reshape(-1, n_var)
+    cat = np.asarray(tables["cat"], dtype=np.int64).reshape(-1, n_var)
+    n_tags = rank.shape[0]
+    # Dummy-Zeile (Index n_tags) für Tasks ohne Tag-Treffer; hält die Matrizen auch ohne Tags gültig
+    base = np.vstack([base, np.zeros((1, n_var))])
+    ziel = np.vstack([ziel, np.zeros((1, n_var), dtype=bool)])
+    cat = np.vstack([cat, np.full((1, n_var), tables["fallback_cat"], dtype=np.int64)])
+    totals = np.zeros((n_var, n_cats), dtype=np.float64)
+    cols = np.arange(n_var)
+
+    for start in range(0, len(matched), CHUNK_TASKS):
+        chunk = matched[start:start + CHUNK_TASKS]
+        t = len(chunk)
+        # Tasks x Tags-Inzidenzmatrix
+        incidence = np.zeros((t, n_tags), dtype=bool)
+        rows = np.repeat(np.arange(t), [len(ids) for ids in chunk])
+        if len(rows):
+            incidence[rows, np.concatenate([np.asarray(ids, dtype=np.int64) for ids in chunk if ids])] = True
+        # First-Match je Variante: kleinster Rang unter den getroffenen Tags (Dummy-Spalte = kein Treffer)
+        ranked = np.where(incidence[:, :, None], rank[None, :, :], tables["missing"])
+        ranked = np.concatenate([ranked, np.full((t, 1, n_var), tables["missing"])], axis=1)
+        first = ranked.argmin(axis=1)                      # Tasks x K
+        has_rule = ranked.min(axis=1) < tables["missing"]   # Tasks x K
+        first = np.where(has_rule, first, n_tags)
+
+        b = base[first, cols]
+        xp = np.broadcast_to(np.asarray(points_xp[start:start + t], dtype=np.float64)[:, None], (t, n_var))
+        mins = np.asarray(minutes[start:start + t], dtype=np.float64)[:, None]
+        time_xp = (mins / BASE_XP_UNIT_MINUTES) * b
+        xp = np.where((xp == 0.0) & (mins > 0) & has_rule, time_xp, xp)
+        xp = np.where((xp == 0.0) & has_rule & ziel[first, cols], b, xp)
+        task_cat = cat[first, cols]
+        for k in range(n_var):
+            totals[k] += np.bincount(task_cat[:, k], weights=xp[:, k], minlength=n_cats)
+    return totals.tolist()
+
+
+def _simulate_python(matched, points_xp, minutes, tables, n_cats):
+    rank, base, ziel, cat = tables["rank"], tables["base"], tables["ziel"], tables["cat"]
+    n_var, fallback_cat = tables["n_var"], tables["fallback_cat"]
+    totals = [[0.0] * n_cats for _ in range(n_var)]
+    for ids, p_xp, mins in zip(matched, points_xp, minutes):
+        for k in range(n_var):
+            present = [u for u in ids if rank[u][k] < tables["missing"]]
+            xp = p_xp
+            if present:
+                u = min(present, key=lambda u: rank[u][k])
+                if xp == 0.0 and mins > 0:
+                    xp = (mins / BASE_XP_UNIT_MINUTES) * base[u][k]
+                if xp == 0.0 and ziel[u][k]:
+                    xp = base[u][k]
+                totals[k][cat[u][k]] += xp
+            else:
+                totals[k][fallback_cat] += xp
+    return totals
+
+
+def simulate(vault_path, rule_files):
+    """ Liefert (varianten_namen, kategorien, summen[variante][kategorie]) für die aktuelle Tabelle plus `rule_files`. """
+    variants = [("aktuell", load_rpg_rules(vault_path))]
+    for path in rule_files:
+        variants.append((os.path.splitext(os.path.basename(path))[0], load_rpg_rules(vault_path, path)))
+
+    tags, categories, tables = build_weight_tables(variants)
+    matcher = TagMatcher(dict.fromkeys(tags, None))
+
+    matched, points_xp, minutes = [], [], []
+    for _, cols in load_task_store(vault_path):
+        for text, points, mins in zip(cols["text"], cols["points"], cols["minutes"]):
+            matched.append(matcher.match_indices(text))
+            points_xp.append(XP_POINTS_MAPPING.get(f"{points}p", 0.0) if points is not None else 0.0)
+            minutes.append(mins)
+
+    kernel = _simulate_numpy if np is not None else _simulate_python
+    totals = kernel(matched, points_xp, minutes, tables, len(categories))
+    return [name for name, _ in variants], categories, totals
+
+
+def print_table(names, categories, totals):
+    width = max(10, *(len(n) for n in names))
+    print(f"{'Kategorie':<14}" + "".join(f"{n:>{width + 2}}" for n in names))
+    for c, cat in enumerate(categories):
+        print(f"{cat:<14}" + "".join(f"{totals[k][c]:>{width + 2}.2f}" for k in range(len(names))))
+    print(f"{'Gesamt':<14}" + "".join(f"{sum(totals[k]):>{width + 2}.2f}" for k in range(len(names))))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Life-RPG What-if-Simulator für XP-Regeltabellen")
+    parser.add_argument("vault_path")
+    parser.add_argument("rule_files", nargs="+", help="Alternative Tabellen im Format von XP_Calculation.md")
+    parser.add_argument("--json", dest="json_path", help="Ergebnis zusätzlich als JSON speichern")
+    args = parser.parse_args()
+
+    names, categories, totals = simulate(args.vault_path, args.rule_files)
+    print_table(names, categories, totals)
+    if args.json_path:
+        result = {
+            "variants": names,
+            "skill_xp": {cat: [round(totals[k][c], 2) for k in range(len(names))] for c, cat in enumerate(categories)},
+            "total_xp": [round(sum(t), 2) for t in totals]
+        }
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# rpg_streaks.py
+# Ziel: Gewohnheits-Streaks je Tag aus XP_Calculation.md über Tages-Bitsets (Python-int, Bit i = Tag EPOCH + i);
+#       aktuelle/längste Serie und Wochenfrequenz per Bit-Operationen, inkrementell je geändertem Tag gepatcht
+
+import os, json, datetime
+
+from rpg_rollups import day_of, parse_day
+
+STREAKS_PATH = '08_System/rpg_streaks_v5.json'
+STREAKS_VERSION = 1
+EPOCH = datetime.date(2000, 1, 1)
+
+
+def day_offset(day):
+    """ Bit-Position eines Tages ("YYYY-MM-DD") oder None (ungültig oder vor EPOCH). """
+    date = parse_day(day)
+    if date is None:
+        return None
+    offset = (date - EPOCH).days
+    return offset if offset >= 0 else None
+
+
+def _popcount(x):
+    return bin(x).count("1")
+
+
+def load_streaks(vault_path, tags):
+    streak_file = os.path.join(vault_path, STREAKS_PATH)
+    try:
+        with open(streak_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (IOError, ValueError):
+        return None
+    if data.get("version") != STREAKS_VERSION or data.get("tags") != list(tags):
+        return None
+    return {tag: int(hex_bits, 16) for tag, hex_bits in data["bits"].items()}
+
+
+def save_streaks(vault_path, tags, bits):
+    streak_file = os.path.join(vault_path, STREAKS_PATH)
+    os.makedirs(os.path.dirname(streak_file), exist_ok=True)
+    data = {"version": STREAKS_VERSION, "epoch": EPOCH.isoformat(), "tags": list(tags),
+            "bits": {tag: format(bits[tag], "x") for tag in tags}}
+    with open(streak_file, "w", encoding="utf-8") as f:
+        f.write(json.dumps(data, separators=(",", ":")))
+
+
+def update_streaks(vault_path, partials, changed_paths, tags, full=False):
+    """
+    Liefert {tag: bitset}. Aus der Datei geladen und nur für die Tage der geänderten Pfade neu gesetzt
+    (Bit löschen, dann für die Tags aller Dateien dieses Tages setzen); ohne Datei, bei --full oder
+    geänderter Tag-Liste aus allen Teil-Aggregaten (partial["tags"]) neu aufgebaut.
+    """
+    bits = None if full else load_streaks(vault_path, tags)
+    if bits is None:
+        bits = dict.fromkeys(tags, 0)
+        touched = None
+    else:
+        touched = {day_of(p) for p in changed_paths}
+        if not touched:
+            return bits
+
+    day_tags = {}
+    for d_str, part in partials:
+        day = d_str[:10]
+        if touched is None or day in touched:
+            day_tags.setdefault(day, set()).update(part["tags"])
+    if touched is not None:
+        # Geänderte Tage zuerst für alle Tags löschen (auch Tage, deren Datei entfernt wurde)
+        clear = 0
+        for day in touched:
+            offset = day_offset(day)
+            if offset is not None:
+                clear |= 1 << offset
+        for tag in bits:
+            bits[tag] &= ~clear
+    for day, day_tag_set in day_tags.items():
+        offset = day_offset(day)
+        if offset is None:
+            continue
+        for tag in day_tag_set:
+            if tag in bits:
+                bits[tag] |= 1 << offset
+    save_streaks(vault_path, tags, bits)
+    return bits
+
+
+def streak_stats(bits, reference_day):
+    """
+    Je Tag: aktuelle Serie bis zum Bezugstag (ist der Bezugstag selbst noch leer, zählt die Serie bis gestern),
+    längste Serie, Tage in den letzten 7 Tagen und Schnitt pro Woche über die letzten 28 Tage.
+    """
+    ref = day_offset(reference_day) if reference_day else None
+    stats = {}
+    for tag, x in bits.items():
+        entry = {"current": 0, "longest": 0, "last_7_days": 0, "per_week_28d": 0.0, "total_days": _popcount(x),
+                 "last_day": (EPOCH + datetime.timedelta(days=x.bit_length() - 1)).isoformat() if x else None}
+        # Längste Serie: x &= x >> 1 verkürzt jede Einser-Folge um 1, die Anzahl Schritte bis 0 ist die längste
+        y, longest = x, 0
+        while y:
+            y &= y >> 1
+            longest += 1
+        entry["longest"] = longest
+        if ref is not None and x:
+            end = ref if (x >> ref) & 1 else ref - 1
+            if end >= 0:
+                mask = (1 << (end + 1)) - 1
+                zeros = ~x & mask
+                entry["current"] = end + 1 if zeros == 0 else end - (zeros.bit_length() - 1)
+            entry["last_7_days"] = _popcount((x >> max(ref - 6, 0)) & 0x7F)
+            entry["per_week_28d"] = round(_popcount((x >> max(ref - 27, 0)) & ((1 << 28) - 1)) / 4, 2)
+        stats[tag] = entry
+    return stats
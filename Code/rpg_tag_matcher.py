@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# rpg_tag_matcher.py
+# Ziel: Alle Tags einer Aufgabe in einem Durchlauf finden (Aho-Corasick), statt pro Tag `tag in task.lower()`
+
+from collections import deque
+
+
+class TagMatcher:
+    """
+    Aho-Corasick-Automat über die Tags aus XP_Calculation.md.
+    Semantik wie bisher: Teilstring-Suche im kleingeschriebenen Text, Treffer in Tabellen-Reihenfolge
+    (der erste Treffer ist die bisherige "first match"-Regel).
+    """
+
+    def __init__(self, tag_rules):
+        self.tags = list(tag_rules.keys())
+        self.rules = [tag_rules[t] for t in self.tags]
+        # Zustände: goto[s] = {zeichen: folgezustand}, out[s] = Tag-Indizes, die in s enden
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for idx, tag in enumerate(self.tags):
+            state = 0
+            for ch in tag:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                    self.goto[state][ch] = nxt
+                state = nxt
+            self.out[state].append(idx)
+        self._build_failure_links()
+        # Fast alle Tags beginnen mit '#': an der Wurzel direkt zum nächsten Startzeichen springen
+        self.start_chars = set(self.goto[0].keys())
+        self.single_start = next(iter(self.start_chars)) if len(self.start_chars) == 1 else None
+
+    def to_state(self):
+        """ Serialisierbarer Zustand des Automaten (für den Regel-Cache). """
+        return {"tags": self.tags, "goto": self.goto, "fail": self.fail, "out": self.out}
+
+    @classmethod
+    def from_state(cls, state, tag_rules):
+        """ Stellt den Automaten ohne Neuaufbau wieder her. """
+        matcher = cls.__new__(cls)
+        matcher.tags = state["tags"]
+        matcher.rules = [tag_rules[t] for t in matcher.tags]
+        matcher.goto = state["goto"]
+        matcher.fail = state["fail"]
+        matcher.out = state["out"]
+        matcher.start_chars = set(matcher.goto[0].keys())
+        matcher.single_start = next(iter(matcher.start_chars)) if len(matcher.start_chars) == 1 else None
+        return matcher
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def match_indices(self, text):
+        """ Sortierte Indizes aller Tags, die im Text vorkommen. """
+        text = text.lower()
+        goto, fail, out = self.goto, self.fail, self.out
+        found = set()
+        state = 0
+        i, n = 0, len(text)
+        while i < n:
+            if state == 0 and self.single_start is not None:
+                i = text.find(self.single_start, i)
+                if i < 0:
+                    break
+            ch = text[i]
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+            i += 1
+        return sorted(found)
+
+    def match(self, text):
+        """ Liste der (tag, regel)-Paare in Tabellen-Reihenfolge. """
+        return [(self.tags[i], self.rules[i]) for i in self.match_indices(text)]
+
+    def first(self, text):
+        """ Erste passende Regel (bisherige Priorität) oder None. """
+        indices = self.match_indices(text)
+        return self.rules[indices[0]] if indices else None
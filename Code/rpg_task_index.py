@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# rpg_task_index.py
+# Ziel: Eingebetteter SQLite-Index aller erledigten (07_Journal) und offenen (todo_list.md) Aufgaben
+#       mit FTS5-Volltextsuche, inkrementell aus dem Task-Store des Manifests synchronisiert
+
+import os, re, json, sqlite3, argparse
+
+from rpg_manifest import content_hash
+from rpg_task_lexer import lex_task, OPEN_TASK_RE
+
+INDEX_PATH = '08_System/rpg_tasks_v5.sqlite'
+INDEX_VERSION = 1
+TODO_LIST_PATH = '01_Core/todo_list.md'
+# Stand des letzten Abgleichs (Regeln, mtime/Größe von todo_list.md): ohne geänderte Journale und bei gleichem
+# Stand wird die Datenbank gar nicht geöffnet
+INDEX_STAMP_PATH = '08_System/rpg_tasks_v5_stamp.json'
+HASHTAG_RE = re.compile(r'#[\w/-]+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, sha1 TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    pos INTEGER NOT NULL,
+    date TEXT,
+    status TEXT NOT NULL,
+    text TEXT NOT NULL,
+    category TEXT NOT NULL,
+    xp REAL NOT NULL,
+    minutes REAL NOT NULL,
+    km REAL NOT NULL,
+    points INTEGER
+);
+CREATE TABLE IF NOT EXISTS task_tags (task_id INTEGER NOT NULL, tag TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_tasks_date ON tasks (date);
+CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks (category, date);
+CREATE INDEX IF NOT EXISTS idx_tasks_path ON tasks (path);
+CREATE INDEX IF NOT EXISTS idx_task_tags_tag ON task_tags (tag, task_id);
+CREATE INDEX IF NOT EXISTS idx_task_tags_task ON task_tags (task_id);
+"""
+
+TASK_COLUMNS = "t.id, t.date, t.status, t.category, t.xp, t.minutes, t.km, t.text"
+
+
+def open_index(vault_path):
+    """
+    Öffnet (und legt bei Bedarf an) die Index-Datenbank. Bei anderer INDEX_VERSION wird sie neu aufgebaut.
+    FTS5 ist optional: fehlt es in der SQLite-Version, sucht search() per LIKE.
+    """
+    db_file = os.path.join(vault_path, INDEX_PATH)
+    os.makedirs(os.path.dirname(db_file), exist_ok=True)
+    conn = sqlite3.connect(db_file)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    if get_meta(conn, "version") != str(INDEX_VERSION):
+        conn.executescript("DELETE FROM files; DELETE FROM tasks; DELETE FROM task_tags; DROP TABLE IF EXISTS tasks_fts;")
+        set_meta(conn, "version", INDEX_VERSION)
+        set_meta(conn, "rules_key", "")
+    try:
+        conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(text, tokenize='unicode61 remove_diacritics 2')")
+        set_meta(conn, "fts", 1)
+    except sqlite3.OperationalError:
+        set_meta(conn, "fts", 0)
+    conn.commit()
+    return conn
+
+
+def load_index_stamp(vault_path):
+    try:
+        with open(os.path.join(vault_path, INDEX_STAMP_PATH), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return None
+
+
+def save_index_stamp(vault_path, stamp):
+    stamp_file = os.path.join(vault_path, INDEX_STAMP_PATH)
+    os.makedirs(os.path.dirname(stamp_file), exist_ok=True)
+    with open(stamp_file, "w", encoding="utf-8") as f:
+        f.write(json.dumps(stamp, separators=(",", ":")))
+
+
+def get_meta(conn, key):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def set_meta(conn, key, value):
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+
+def _delete_paths(conn, paths, has_fts):
+    for path in paths:
+        ids = "SELECT id FROM tasks WHERE path = ?"
+        if has_fts:
+            conn.execute(f"DELETE FROM tasks_fts WHERE rowid IN ({ids})", (path,))
+        conn.execute(f"DELETE FROM task_tags WHERE task_id IN ({ids})", (path,))
+        conn.execute("DELETE FROM tasks WHERE path = ?", (path,))
+        conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+
+def sync_task_index(vault_path, entries, tag_matcher, rules_key, score_tasks, changed_paths=None):
+    """
+    Gleicht den Index mit dem Task-Store ab (`entries` = Manifest- und Siegel-Einträge nach collect_partials).
+    `score_tasks` ist die Bewertung des Sync-Kerns (obsidian_rpg_sync_v5.score_tasks), übergeben statt importiert,
+    damit dieses Modul nicht zurück in den Sync-Kern importiert.
+    Nur Dateien mit geändertem sha1 werden ersetzt, gelöschte entfernt; bei geänderten Regeln
+    werden Kategorie und XP aller Aufgaben aus den gespeicherten Spalten neu bewertet (ohne Markdown).
+    Ist `changed_paths` (geänderte Journale aus collect_partials) leer und sind Regeln und todo_list.md
+    unverändert (INDEX_STAMP_PATH), kehrt die Funktion zurück, ohne die Datenbank zu öffnen.
+    Gibt die Anzahl der neu indizierten Dateien zurück.
+    """
+    todo_file = os.path.join(vault_path, TODO_LIST_PATH)
+    try:
+        st = os.stat(todo_file)
+        todo_fingerprint = [st.st_mtime_ns, st.st_size]
+    except OSError:
+        todo_fingerprint = None
+    stamp = {"version": INDEX_VERSION, "rules_key": rules_key, "todo": todo_fingerprint}
+    if (changed_paths is not None and not changed_paths and load_index_stamp(vault_path) == stamp
+            and os.path.exists(os.path.join(vault_path, INDEX_PATH))):
+        return 0
+
+    sources = {rel_path: (entry["sha1"], "done", os.path.basename(rel_path)[:10], entry["tasks"])
+               for rel_path, entry in entries.items()}
+    if todo_fingerprint is not None:
+        with open(todo_file, "rb") as f:
+            raw = f.read()
+        records = [lex_task(t.strip(), None) for t in OPEN_TASK_RE.findall(raw.decode("utf-8"))]
+        todo_cols = {"text": [r.text for r in records], "points": [r.points for r in records],
+                     "minutes": [r.minutes for r in records], "km": [r.km for r in records]}
+        sources[TODO_LIST_PATH] = (content_hash(raw), "open", None, todo_cols)
+
+    conn = open_index(vault_path)
+    try:
+        has_fts = get_meta(conn, "fts") == "1"
+        stored = dict(conn.execute("SELECT path, sha1 FROM files"))
+        rules_changed = get_meta(conn, "rules_key") != rules_key
+        changed = [p for p, src in sources.items() if rules_changed or stored.get(p) != src[0]]
+        removed = [p for p in stored if p not in sources]
+        if not changed and not removed:
+            save_index_stamp(vault_path, stamp)
+            return 0
+
+        with conn:
+            _delete_paths(conn, removed + [p for p in changed if p in stored], has_fts)
+            columns = [sources[p][3] for p in changed]
+            # tag_ids der Journal-Spalten sind nach collect_partials aktuell; todo-Spalten werden hier gematcht
+            tag_ids, xp_values, _ = score_tasks(columns, tag_matcher, reuse_tag_ids=True)
+            next_id = (conn.execute("SELECT MAX(id) FROM tasks").fetchone()[0] or 0) + 1
+            task_rows, tag_rows, fts_rows = [], [], []
+            flat = 0
+            for path, cols in zip(changed, columns):
+                _, status, d_str, _ = sources[path]
+                for pos, (text, points, mins, km) in enumerate(zip(cols["text"], cols["points"], cols["minutes"], cols["km"])):
+                    ids = tag_ids[flat]
+                    category = tag_matcher.rules[ids[0]]["category"] if ids else "Allgemein"
+                    task_rows.append((next_id, path, pos, d_str, status, text, category, xp_values[flat],
+                                      mins, km, int(points) if points is not None else None))
+                    tag_rows.extend((next_id, tag) for tag in dict.fromkeys(t.lower() for t in HASHTAG_RE.findall(text)))
+                    fts_rows.append((next_id, text))
+                    next_id += 1
+                    flat += 1
+            conn.executemany("INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", task_rows)
+            conn.executemany("INSERT INTO task_tags VALUES (?, ?)", tag_rows)
+            if has_fts:
+                conn.executemany("INSERT INTO tasks_fts (rowid, text) VALUES (?, ?)", fts_rows)
+            conn.executemany("INSERT INTO files VALUES (?, ?)", [(p, sources[p][0]) for p in changed])
+            set_meta(conn, "rules_key", rules_key)
+        save_index_stamp(vault_path, stamp)
+        return len(changed)
+    finally:
+        conn.close()
+
+
+# --- ABFRAGEN ---
+def _fts_query(text):
+    # Jedes Wort als Phrase (Präfixsuche), damit Sonderzeichen wie '#' oder '-' keine FTS-Syntax auslösen
+    words = re.findall(r'\w+', text)
+    return " ".join(f'"{w}"*' for w in words)
+
+
+def search(conn, text, status=None, limit=50):
+    """ Volltextsuche über den Aufgabentext, neueste zuerst. """
+    status_sql = " AND t.status = ?" if status else ""
+    params = [status] if status else []
+    query = _fts_query(text)
+    if not query:
+        # Leere Suche: alle Aufgaben (z.B. mit --open die komplette ToDo-Liste)
+        sql = f"SELECT {TASK_COLUMNS} FROM tasks t WHERE 1 = 1{status_sql} ORDER BY t.date DESC, t.id DESC LIMIT ?"
+        return conn.execute(sql, params + [limit]).fetchall()
+    if get_meta(conn, "fts") == "1":
+        sql = (f"SELECT {TASK_COLUMNS} FROM tasks_fts JOIN tasks t ON t.id = tasks_fts.rowid "
+               f"WHERE tasks_fts MATCH ?{status_sql} ORDER BY t.date DESC, t.id DESC LIMIT ?")
+        return conn.execute(sql, [query] + params + [limit]).fetchall()
+    sql = f"SELECT {TASK_COLUMNS} FROM tasks t WHERE t.text LIKE ?{status_sql} ORDER BY t.date DESC, t.id DESC LIMIT ?"
+    return conn.execute(sql, [f"%{text}%"] + params + [limit]).fetchall()
+
+
+def tasks_by_tag(conn, tag, since=None, until=None, status=None, limit=50):
+    """ Aufgaben mit einem Hashtag (z.B. "#bouldern"), neueste zuerst. """
+    sql = f"SELECT {TASK_COLUMNS} FROM task_tags g JOIN tasks t ON t.id = g.task_id WHERE g.tag = ?"
+    params = [tag.lower() if tag.startswith("#") else "#" + tag.lower()]
+    if since:
+        sql += " AND t.date >= ?"
+        params.append(since)
+    if until:
+        sql += " AND t.date <= ?"
+        params.append(until)
+    if status:
+        sql += " AND t.status = ?"
+        params.append(status)
+    sql += " ORDER BY t.date DESC, t.id DESC LIMIT ?"
+    return conn.execute(sql, params + [limit]).fetchall()
+
+
+def last_done(conn, tag):
+    """ Letzte erledigte Aufgabe mit diesem Hashtag oder None. """
+    rows = tasks_by_tag(conn, tag, status="done", limit=1)
+    return rows[0] if rows else None
+
+
+def completed_on(conn, day):
+    """ Texte der an einem Tag erledigten Aufgaben in Datei-/Zeilenreihenfolge. """
+    rows = conn.execute("SELECT text FROM tasks WHERE status = 'done' AND date = ? ORDER BY path, pos", (day,))
+    return [row[0] for row in rows]
+
+
+def category_summary(conn, since=None, until=None):
+    """ [(kategorie, anzahl, xp, minuten)] der erledigten Aufgaben im Zeitraum. """
+    sql = "SELECT category, COUNT(*), ROUND(SUM(xp), 2), ROUND(SUM(minutes), 1) FROM tasks WHERE status = 'done'"
+    params = []
+    if since:
+        sql += " AND date >= ?"
+        params.append(since)
+    if until:
+        sql += " AND date <= ?"
+        params.append(until)
+    return conn.execute(sql + " GROUP BY category ORDER BY SUM(xp) DESC", params).fetchall()
+
+
+def print_rows(rows):
+    for _, date, status, category, xp, minutes, _, text in rows:
+        print(f"{date or 'offen':<10}  {category:<12} {xp:6.2f} XP  {text}")
+    print(f"({len(rows)} Treffer)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Life-RPG Task-Index (SQLite/FTS5)")
+    parser.add_argument("vault_path")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_search = sub.add_parser("search", help="Volltextsuche im Aufgabentext")
+    p_search.add_argument("text")
+    p_last = sub.add_parser("last", help="Wann zuletzt erledigt? (Hashtag)")
+    p_last.add_argument("tag")
+    p_tag = sub.add_parser("tag", help="Alle Aufgaben mit einem Hashtag")
+    p_tag.add_argument("tag")
+    p_tag.add_argument("--since")
+    p_tag.add_argument("--until")
+    p_cat = sub.add_parser("categories", help="XP/Minuten je Kategorie")
+    p_cat.add_argument("--since")
+    p_cat.add_argument("--until")
+    for p in (p_search, p_tag):
+        p.add_argument("--open", action="store_true", help="Nur offene Aufgaben aus todo_list.md")
+        p.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    db_file = os.path.join(args.vault_path, INDEX_PATH)
+    if not os.path.exists(db_file):
+        print(f"Fehler: Kein Index unter {db_file}. Zuerst den Sync ausführen.")
+        raise SystemExit(1)
+    conn = sqlite3.connect(db_file)
+    if args.command == "search":
+        print_rows(search(conn, args.text, "open" if args.open else None, args.limit))
+    elif args.command == "last":
+        row = last_done(conn, args.tag)
+        print(f"{args.tag}: zuletzt am {row[1]} - {row[7]}" if row else f"{args.tag}: nie erledigt")
+    elif args.command == "tag":
+        print_rows(tasks_by_tag(conn, args.tag, args.since, args.until, "open" if args.open else None, args.limit))
+    else:
+        for category, count, xp, minutes in category_summary(conn, args.since, args.until):
+            print(f"{category:<14} {count:6d} Aufgaben {xp:10.2f} XP {minutes:10.1f} min")
+    conn.close()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# rpg_task_lexer.py
+# Ziel: Eine Aufgabenzeile in einem einzigen Regex-Durchlauf zerlegen (Punkte, Dauer, km, Zeit, Ziele, Links)
+
+import re
+
+COMPLETED_TASK_RE = re.compile(r'^\s*- \[x\]\s*(.*)', re.MULTILINE)
+OPEN_TASK_RE = re.compile(r'^\s*- \[ \]\s*(.*)', re.MULTILINE)
+
+# Alle Token-Arten als Lookahead: jede Position wird genau einmal geprüft, Token dürfen sich
+# überlappen (z.B. "(30m)" innerhalb eines [[Links]]) - identisch zu den früheren Einzel-Suchen.
+# Der vorgeschaltete Zeichen-Check lässt alle Positionen ohne '(', '@' oder '[' sofort fallen.
+TASK_TOKEN_RE = re.compile(
+    r'(?=[(@\[])(?=(?:'
+    r'(?P<dur>(?i:\((?:(?P<h>\d+)\s*h)?\s*(?P<m>\d+)\s*m(?:in)?\)))'
+    r'|(?P<mss>(?i:\((?P<mss_m>\d+):(?P<mss_s>\d{2})\s*min\)))'
+    r'|(?P<km>(?i:\((?P<km_val>\d+\.?\d*)\s*km\)))'
+    r'|(?P<pts>\((?P<p>\d+)p\))'
+    r'|(?P<goal>(?i:@(?P<goal_name>[\w\-]+)(?:\((?P<goal_count>\d+(?:\.\d+)?)\)'
+    r'|\[(?P<goal_count_b>\d+(?:\.\d+)?)\]|[,;]\s*(?P<goal_count_c>\d+(?:\.\d+)?))))'
+    r'|(?P<link>\[\[(?P<link_name>.*?)\]\])'
+    r'))'
+)
+
+
+class TaskRecord:
+    """ Kompakte, geparste Aufgabe. Felder sind 0.0/None/() wenn das Token fehlt. """
+    __slots__ = ("date", "text", "points", "minutes", "km", "time_value", "tag_ids", "goal_refs", "links")
+
+    def __init__(self, date, text, points, minutes, km, time_value, tag_ids, goal_refs, links):
+        self.date = date
+        self.text = text
+        self.points = points          # Roh-Ziffern aus "(3p)" als String (Schlüssel für XP_POINTS_MAPPING)
+        self.minutes = minutes        # "(1h 30m)" bzw. ersatzweise "(3:40 min)"
+        self.km = km                  # "(5.2km)"
+        self.time_value = time_value  # "(3:40 min)" als Minuten-Float (z.B. SallyUp)
+        self.tag_ids = tag_ids        # Indizes in TagMatcher.tags, Tabellen-Reihenfolge
+        self.goal_refs = goal_refs    # ((name, count), ...) aus "@Name(3)", "@Name[3]" oder "@Name, 3"
+        self.links = links            # ("Person", ...) aus "[[Person]]"
+
+
+def lex_task(text, date, tag_matcher=None):
+    points = None
+    std_minutes = None
+    mss_minutes = None
+    km = None
+    goal_refs = []
+    links = []
+
+    for m in TASK_TOKEN_RE.finditer(text):
+        # lastgroup ist die äußere (zuletzt geschlossene) Gruppe, also die Token-Art
+        kind = m.lastgroup
+        if kind == "dur":
+            if std_minutes is None:
+                std_minutes = float(int(m.group("h") or 0) * 60 + int(m.group("m")))
+        elif kind == "mss":
+            if mss_minutes is None:
+                mss_minutes = int(m.group("mss_m")) + (int(m.group("mss_s")) / 60.0)
+        elif kind == "km":
+            if km is None:
+                km = float(m.group("km_val"))
+        elif kind == "pts":
+            if points is None:
+                points = m.group("p")
+        elif kind == "goal":
+            # "@Name(3)", "#Tag@Name[3]" und "#Tag@Name, 3" sind gleichwertig
+            count = m.group("goal_count") or m.group("goal_count_b") or m.group("goal_count_c")
+            goal_refs.append((m.group("goal_name"), float(count)))
+        else:
+            links.append(m.group("link_name"))
+
+    if std_minutes is not None:
+        minutes = std_minutes
+    elif mss_minutes is not None:
+        minutes = mss_minutes
+    else:
+        minutes = 0.0
+
+    return TaskRecord(
+        date, text, points, minutes,
+        km or 0.0, mss_minutes or 0.0,
+        tuple(tag_matcher.match_indices(text)) if tag_matcher else (),
+        tuple(goal_refs), tuple(links)
+    )
+
+
+def lex_journal(content, date, tag_matcher=None):
+    """ Alle abgeschlossenen Aufgaben einer Journal-Datei als TaskRecords (tag_ids nur mit tag_matcher). """
+    return [lex_task(task, date, tag_matcher) for task in COMPLETED_TASK_RE.findall(content)]
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# rpg_walker.py
+# Ziel: Ein einziger os.scandir-Durchlauf über alle relevanten Vault-Ordner, der jede Datei an ihr Subsystem
+#       (journal, people, mood, thoughts, skills, core) weiterreicht. Ordner-Listings werden je Ordner-mtime
+#       gecacht: ein unveränderter Ordner wird nicht erneut gelesen, nur seine Dateien (falls nötig) per stat geprüft
+
+import os, json
+
+WALK_PATH = '08_System/rpg_walk_v5.json'
+WALK_VERSION = 1
+# Wurzelordner -> (Subsystem, braucht stat je Datei). Subsysteme ohne stat brauchen nur die Dateinamen
+# (Skill-Struktur, Anzahl Gedanken) und kosten bei unverändertem Ordner keinen einzigen Dateizugriff.
+ROUTES = {
+    "01_Core": ("core", True),
+    "02_People": ("people", True),
+    "03_Skills": ("skills", False),
+    "04_Emotions/Moodlog": ("mood", True),
+    "05_Thoughts": ("thoughts", False),
+    "07_Journal": ("journal", True),
+}
+
+
+def load_walk_cache(vault_path):
+    walk_file = os.path.join(vault_path, WALK_PATH)
+    try:
+        with open(walk_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (IOError, ValueError):
+        return {}
+    return data["dirs"] if data.get("version") == WALK_VERSION else {}
+
+
+def save_walk_cache(vault_path, dirs):
+    walk_file = os.path.join(vault_path, WALK_PATH)
+    os.makedirs(os.path.dirname(walk_file), exist_ok=True)
+    payload = json.dumps({"version": WALK_VERSION, "dirs": dirs}, ensure_ascii=False, separators=(",", ":"))
+    with open(walk_file, "w", encoding="utf-8") as f:
+        f.write(payload)
+
+
+def walk_vault(vault_path, prune=None, full=False, report=None):
+    """
+    Liefert {subsystem: [(rel_pfad, pfad, stat_result oder None), ...]} für alle .md-Dateien der ROUTES-Ordner,
+    je Ordner nach Namen sortiert. `prune(subsystem, rel_ordner, mtime_ns)` kann einen Teilbaum überspringen
+    (z.B. versiegelte Journal-Monate), bevor er gelesen wird. Versteckte Einträge werden ignoriert.
+    """
+    cache = {} if full else load_walk_cache(vault_path)
+    new_cache = {}
+    routed = {route: [] for route, _ in ROUTES.values()}
+    counters = {"dirs": 0, "listed": 0}
+
+    def visit(rel_dir, full_dir, mtime, route, need_stat):
+        if prune is not None and prune(route, rel_dir, mtime):
+            return
+        counters["dirs"] += 1
+        old = cache.get(rel_dir)
+        subdirs = []
+        if old and old["mtime"] == mtime:
+            # Ordner unverändert: Listing aus dem Cache, nur Unterordner (und ggf. Dateien) per stat
+            new_cache[rel_dir] = old
+            for name in old["files"]:
+                path = os.path.join(full_dir, name)
+                st = None
+                if need_stat:
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                routed[route].append((f"{rel_dir}/{name}", path, st))
+            for name in old["dirs"]:
+                path = os.path.join(full_dir, name)
+                try:
+                    subdirs.append((name, path, os.stat(path).st_mtime_ns))
+                except OSError:
+                    continue
+        else:
+            counters["listed"] += 1
+            files, dir_names = [], []
+            try:
+                with os.scandir(full_dir) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                return
+            for e in entries:
+                if e.name.startswith("."):
+                    continue
+                try:
+                    if e.is_dir():
+                        subdirs.append((e.name, e.path, e.stat().st_mtime_ns))
+                        dir_names.append(e.name)
+                    elif e.name.endswith(".md"):
+                        # DirEntry.stat() kommt unter Windows aus dem Listing, sonst genau ein stat je Datei
+                        routed[route].append((f"{rel_dir}/{e.name}", e.path, e.stat() if need_stat else None))
+                        files.append(e.name)
+                except OSError:
+                    continue
+            new_cache[rel_dir] = {"mtime": mtime, "dirs": dir_names, "files": files}
+        for name, path, sub_mtime in subdirs:
+            visit(f"{rel_dir}/{name}", path, sub_mtime, route, need_stat)
+
+    for root_rel, (route, need_stat) in ROUTES.items():
+        root_dir = os.path.join(vault_path, *root_rel.split("/"))
+        try:
+            root_mtime = os.stat(root_dir).st_mtime_ns
+        except OSError:
+            continue
+        visit(root_rel, root_dir, root_mtime, route, need_stat)
+
+    if new_cache != cache:
+        save_walk_cache(vault_path, new_cache)
+    if report is not None:
+        report["walked_dirs"], report["listed_dirs"] = counters["dirs"], counters["listed"]
+    return routed
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# rpg_watch.py
+# Ziel: Dauerprozess, der alle vom Sync gelesenen Ordner (rpg_walker.ROUTES) beobachtet und nach Änderungen
+#       (entprellt) neu synchronisiert
+
+import os, sys, time, struct, select, argparse, ctypes, ctypes.util
+
+from obsidian_rpg_sync_v5 import scan_vault
+from rpg_walker import ROUTES
+
+DEBOUNCE_SECONDS = 0.3   # Obsidian speichert beim Tippen in kurzen Schüben
+POLL_INTERVAL = 2.0      # nur für den Polling-Fallback (stat je Notiz, Listings nur bei geänderter Ordner-mtime)
+# Marker in der Änderungsmenge: Ereignisse gingen verloren (inotify-Überlauf, Ordner verschoben), also ohne
+# `touched` synchronisieren und die Beobachtung neu aufbauen
+FULL_RESYNC = "*"
+
+# inotify-Konstanten (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def watch_roots(vault_path):
+    """ Die Wurzelordner aller Subsysteme des Syncs (Core, People, Skills, Moodlog, Thoughts, Journal). """
+    return [os.path.join(vault_path, *root_rel.split("/")) for root_rel in ROUTES]
+
+
+def is_relevant(rel_path):
+    """ Nur Notizen, die der Vault-Durchlauf liest (.md unter einem ROUTES-Ordner), lösen einen Sync aus. """
+    rel_path = rel_path.replace(os.sep, "/")
+    if not rel_path.endswith(".md") or any(part.startswith(".") for part in rel_path.split("/")):
+        return False
+    return any(rel_path.startswith(root_rel + "/") for root_rel in ROUTES)
+
+
+class InotifyWatcher:
+    """
+    Rekursive inotify-Beobachtung über ctypes (Linux). Fehlt ein Wurzelordner beim Start, wird sein nächster
+    vorhandener Elternordner beobachtet, bis er angelegt wird.
+    """
+
+    def __init__(self, vault_path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 fehlgeschlagen")
+        self.vault_path = vault_path
+        self.roots = watch_roots(vault_path)
+        self.dirs = {}
+        self.arm()
+
+    def arm(self):
+        """
+        Beobachtet alle vorhandenen Wurzelordner rekursiv (erneutes Hinzufügen ist harmlos) und für fehlende deren
+        nächsten vorhandenen Elternordner. Liefert die Notizen in Ordnern, die dabei neu hinzukamen.
+        """
+        known = set(self.dirs.values())
+        found = set()
+        for root_dir in self.roots:
+            if os.path.isdir(root_dir):
+                for root, _, files in os.walk(root_dir):
+                    if root not in known:
+                        found.update(os.path.relpath(os.path.join(root, f), self.vault_path) for f in files)
+                    self._watch_dir(root)
+                continue
+            parent = os.path.dirname(root_dir)
+            while not os.path.isdir(parent) and len(parent) > len(self.vault_path):
+                parent = os.path.dirname(parent)
+            self._watch_dir(parent)
+        return found
+
+    def _in_roots(self, path):
+        return any(path == root or path.startswith(root + os.sep) for root in self.roots)
+
+    def _watch_dir(self, path):
+        if not os.path.isdir(path):
+            return
+        wd = self._add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch fehlgeschlagen: {path}")
+        self.dirs[wd] = path
+
+    def wait(self, timeout):
+        """ Wartet bis zu `timeout` Sekunden (None = unbegrenzt) und liefert die geänderten relativen Pfade. """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        buf = os.read(self.fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset < len(buf):
+            wd, mask, _, name_len = EVENT_HEADER.unpack_from(buf, offset)
+            offset += EVENT_HEADER.size
+            name = buf[offset:offset + name_len].rstrip(b"\0").decode("utf-8", "replace")
+            offset += name_len
+            if mask & IN_Q_OVERFLOW:
+                # Warteschlange übergelaufen (wd = -1): Ereignisse fehlen, alles neu prüfen
+                changed.add(FULL_RESYNC)
+                continue
+            if mask & IN_IGNORED:
+                # Beobachtung entfernt (Ordner gelöscht); ein neu angelegter Ordner bekommt einen neuen wd
+                self.dirs.pop(wd, None)
+                continue
+            parent = self.dirs.get(wd)
+            if parent is None or not name:
+                continue
+            full_path = os.path.join(parent, name)
+            if mask & IN_ISDIR:
+                if not self._in_roots(full_path):
+                    # Ordner außerhalb der Wurzeln: vielleicht wurde ein fehlender Wurzelordner angelegt
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        changed.update(self.arm())
+                elif mask & (IN_CREATE | IN_MOVED_TO):
+                    # Neuer Ordner (z.B. Monatsordner): mitbeobachten und bereits enthaltene Dateien melden
+                    for root, _, files in os.walk(full_path):
+                        self._watch_dir(root)
+                        changed.update(os.path.relpath(os.path.join(root, f), self.vault_path) for f in files)
+                else:
+                    # Ordner gelöscht/verschoben: einzelne Dateiereignisse gibt es dafür nicht
+                    changed.add(FULL_RESYNC)
+                continue
+            changed.add(os.path.relpath(full_path, self.vault_path))
+        if FULL_RESYNC in changed:
+            self.arm()
+            return {FULL_RESYNC} | {p for p in changed if is_relevant(p)}
+        return {p for p in changed if is_relevant(p)}
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """
+    Fallback ohne inotify (Windows, macOS): vergleicht mtime/Größe der relevanten Dateien. Ordner-Listings werden
+    je Ordner-mtime im Speicher gehalten (wie rpg_walker), ein Durchlauf kostet dann nur stat-Aufrufe.
+    """
+
+    def __init__(self, vault_path):
+        self.vault_path = vault_path
+        self.listings = {}   # ordner -> (mtime_ns, [dateinamen], [unterordner])
+        self.snapshot = self._take_snapshot()
+
+    def _listing(self, path):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return [], []
+        old = self.listings.get(path)
+        if old and old[0] == mtime:
+            return old[1], old[2]
+        files, dirs = [], []
+        try:
+            with os.scandir(path) as it:
+                for e in it:
+                    if e.name.startswith("."):
+                        continue
+                    if e.is_dir():
+                        dirs.append(e.name)
+                    elif e.name.endswith(".md"):
+                        files.append(e.name)
+        except OSError:
+            return [], []
+        self.listings[path] = (mtime, files, dirs)
+        return files, dirs
+
+    def _take_snapshot(self):
+        snap = {}
+        stack = watch_roots(self.vault_path)
+        seen = set()
+        while stack:
+            path = stack.pop()
+            seen.add(path)
+            files, dirs = self._listing(path)
+            stack.extend(os.path.join(path, d) for d in dirs)
+            for f in files:
+                full_path = os.path.join(path, f)
+                try:
+                    st = os.stat(full_path)
+                except OSError:
+                    continue
+                snap[os.path.relpath(full_path, self.vault_path)] = (st.st_mtime_ns, st.st_size)
+        # Listings gelöschter Ordner vergessen
+        for path in self.listings.keys() - seen:
+            del self.listings[path]
+        return snap
+
+    def wait(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            new_snap = self._take_snapshot()
+            changed = {p for p in set(new_snap) | set(self.snapshot) if new_snap.get(p) != self.snapshot.get(p)}
+            self.snapshot = new_snap
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(POLL_INTERVAL if deadline is None else min(POLL_INTERVAL, max(deadline - time.monotonic(), 0)))
+
+    def close(self):
+        pass
+
+
+def make_watcher(vault_path, force_polling=False):
+    if not force_polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(vault_path)
+        except (OSError, AttributeError) as e:
+            print(f"[WARN] inotify nicht verfügbar, nutze Polling: {e}")
+    return PollingWatcher(vault_path)
+
+
+def watch(vault_path, debounce=DEBOUNCE_SECONDS, force_polling=False, jobs=1, on_sync=None):
+    """
+    Initialer Sync, danach entprellter inkrementeller Sync bei jeder relevanten Änderung.
+    `on_sync(output)` wird nach jedem Sync mit dem Ausgabe-Dict aufgerufen (z.B. vom Dashboard-Server).
+    """
+    output = scan_vault(vault_path, jobs=jobs)
+    if on_sync:
+        on_sync(output)
+    watcher = make_watcher(vault_path, force_polling)
+    print(f"--- Watch-Modus aktiv ({type(watcher).__name__}), Strg+C zum Beenden ---")
+    try:
+        while True:
+            changed = watcher.wait(None)
+            if not changed:
+                continue
+            # Entprellen: sammeln, bis für `debounce` Sekunden Ruhe ist
+            while True:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            if FULL_RESYNC in changed:
+                # Einzelne Ereignisse fehlen: ohne `touched`, der Sync prüft alle Ordner und Siegel selbst
+                print("[WATCH] Ereignisse verloren (Überlauf oder verschobener Ordner), synchronisiere alles")
+                touched = None
+            else:
+                print(f"[WATCH] {len(changed)} Änderung(en): {', '.join(sorted(changed)[:5])}{' ...' if len(changed) > 5 else ''}")
+                touched = changed
+            started = time.perf_counter()
+            output = scan_vault(vault_path, jobs=jobs, touched=touched)
+            print(f"[WATCH] Sync in {(time.perf_counter() - started) * 1000:.0f} ms")
+            if on_sync:
+                on_sync(output)
+    except KeyboardInterrupt:
+        print("--- Watch-Modus beendet ---")
+    finally:
+        watcher.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Life-RPG Watch-Modus")
+    parser.add_argument("vault_path", nargs="?", default=".")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS, help="Ruhezeit in Sekunden vor dem Sync")
+    parser.add_argument("--poll", action="store_true", help="Polling statt inotify erzwingen")
+    parser.add_argument("--jobs", type=int, default=1)
+    args = parser.parse_args()
+    watch(args.vault_path, args.debounce, args.poll, args.jobs)
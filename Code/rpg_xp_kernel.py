@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# rpg_xp_kernel.py
+# Ziel: XP für viele Aufgaben auf einmal aus Spalten berechnen (NumPy, falls installiert; sonst reines Python)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy ist optional
+    np = None
+
+
+def score_xp(points_xp, minutes, rule_idx, base_xp, is_ziel, base_unit_minutes):
+    """
+    XP je Aufgabe mit der Priorität aus scan_vault:
+      1. Punkte "(3p)",
+      2. sonst Zeit: minutes / base_unit_minutes * base_xp der ersten passenden Regel,
+      3. sonst pauschal base_xp, wenn die erste Regel Modus "Ziel" hat.
+    `rule_idx` ist -1 für Aufgaben ohne Tag-Treffer. Gibt eine Liste von Python-Floats zurück;
+    beide Varianten rechnen elementweise identisch (gleiche Operationsreihenfolge).
+    """
+    if not points_xp:
+        return []
+    if np is not None:
+        return _score_xp_numpy(points_xp, minutes, rule_idx, base_xp, is_ziel, base_unit_minutes)
+    return _score_xp_python(points_xp, minutes, rule_idx, base_xp, is_ziel, base_unit_minutes)
+
+
+def _score_xp_numpy(points_xp, minutes, rule_idx, base_xp, is_ziel, base_unit_minutes):
+    xp = np.asarray(points_xp, dtype=np.float64)
+    mins = np.asarray(minutes, dtype=np.float64)
+    idx = np.asarray(rule_idx, dtype=np.int64)
+    has_rule = idx >= 0
+    safe_idx = np.where(has_rule, idx, 0)
+    # Leere Regeltabelle: Dummy-Eintrag, has_rule ist dann überall False
+    base = np.asarray(base_xp or [0.0], dtype=np.float64)[safe_idx]
+    ziel = np.asarray(is_ziel or [False], dtype=bool)[safe_idx]
+
+    time_xp = (mins / base_unit_minutes) * base
+    xp = np.where((xp == 0.0) & (mins > 0) & has_rule, time_xp, xp)
+    xp = np.where((xp == 0.0) & has_rule & ziel, base, xp)
+    return xp.tolist()
+
+
+def _score_xp_python(points_xp, minutes, rule_idx, base_xp, is_ziel, base_unit_minutes):
+    result = []
+    for xp, mins, idx in zip(points_xp, minutes, rule_idx):
+        if idx >= 0:
+            if xp == 0.0 and mins > 0:
+                xp = (mins / base_unit_minutes) * base_xp[idx]
+            if xp == 0.0 and is_ziel[idx]:
+                xp = base_xp[idx]
+        result.append(xp)
+    return result
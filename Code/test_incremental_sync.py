@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# test_incremental_sync.py
+# Ziel: Der inkrementelle Sync (Manifest, Siegel, Stores) muss exakt dieselbe Ausgabe liefern wie --full
+
+import os, sys, json, datetime, subprocess
+
+import pytest
+
+import obsidian_rpg_sync_v5
+from obsidian_rpg_sync_v5 import run_sync
+from rpg_prefix import load_prefix
+
+RULES = """
+| Tag    | Kategorie     | Basis_XP | Modus  | Metrik |
+| :----- | :------------ | :------- | :----- | :----- |
+| #task  | Allgemein     | 1.0      | Zeit   | -      |
+| #study | Intellektuell | 1.0      | Zeit   | -      |
+| #run   | Physisch      | 5.0      | Metrik | km     |
+"""
+
+# Zwei abgeschlossene Monate (werden versiegelt) und der laufende Monat (bleibt im Manifest)
+TODAY = datetime.date.today()
+OPEN_MONTH = TODAY.strftime("%Y-%m")
+JOURNALS = {
+    "2025-01/2025-01-05.md": "- [x] Lernen (1h 30m) #study\n- [x] Laufen (5km) (30:00min) #run\n",
+    "2025-01/2025-01-06.md": "- [x] Aufräumen (3p) #task\n",
+    "2025-02/2025-02-10.md": "- [x] Laufen (10km) (55:00min) #run\n- [ ] Offen #task\n",
+    f"{OPEN_MONTH}/{OPEN_MONTH}-01.md": "- [x] Lernen (45m) #study\n- [x] Laufen (3km) (20:00min) #run\n",
+}
+
+
+def make_vault(root):
+    os.makedirs(os.path.join(root, "01_Core"))
+    with open(os.path.join(root, "01_Core", "XP_Calculation.md"), "w", encoding="utf-8") as f:
+        f.write(RULES)
+    for rel, content in JOURNALS.items():
+        write(root, rel, content)
+    return str(root)
+
+
+def write(root, rel, content, mode="w"):
+    path = os.path.join(root, "07_Journal", *rel.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, mode, encoding="utf-8") as f:
+        f.write(content)
+
+
+def assert_matches_full(vault, report=None):
+    incremental = run_sync(vault, report=report)
+    assert incremental == run_sync(vault, full=True)
+    return incremental
+
+
+def test_in_place_edit_breaks_seal(tmp_path):
+    vault = make_vault(tmp_path)
+    run_sync(vault)
+    report = {}
+    run_sync(vault, report=report)
+    assert report["sealed"] == 2
+
+    # Anhängen ändert mtime und Größe der Datei, aber nicht die mtime des Monatsordners
+    month_dir = os.path.join(vault, "07_Journal", "2025-01")
+    dir_mtime = os.stat(month_dir).st_mtime_ns
+    write(vault, "2025-01/2025-01-06.md", "- [x] Extra (5km) (25:00min) #run\n", mode="a")
+    assert os.stat(month_dir).st_mtime_ns == dir_mtime
+
+    output = assert_matches_full(vault)
+    assert output["run_metrics"]["total_km"] == 23.0
+
+
+def test_rules_edit_rescores_seals_without_parsing(tmp_path):
+    vault = make_vault(tmp_path)
+    run_sync(vault)
+    run_sync(vault)
+
+    rules_file = os.path.join(vault, "01_Core", "XP_Calculation.md")
+    with open(rules_file, "w", encoding="utf-8") as f:
+        f.write(RULES.replace("| Physisch      | 5.0 ", "| Physisch      | 8.0 "))
+
+    report = {}
+    assert_matches_full(vault, report)
+    assert report["parsed"] == 0
+    assert report["rescored"] == 4
+
+
+def test_added_file_matches_full(tmp_path):
+    vault = make_vault(tmp_path)
+    run_sync(vault)
+    write(vault, f"{OPEN_MONTH}/{OPEN_MONTH}-02.md", "- [x] Laufen (7km) (40:00min) #run\n")
+    write(vault, "2025-02/2025-02-11.md", "- [x] Aufräumen (1p) #task\n")
+
+    report = {}
+    output = assert_matches_full(vault, report)
+    assert report["parsed"] == 2
+    assert output["run_metrics"]["total_km"] == 25.0
+
+
+def test_deleted_file_matches_full(tmp_path):
+    vault = make_vault(tmp_path)
+    run_sync(vault)
+    run_sync(vault)
+    os.remove(os.path.join(vault, "07_Journal", f"{OPEN_MONTH}", f"{OPEN_MONTH}-01.md"))
+    os.remove(os.path.join(vault, "07_Journal", "2025-01", "2025-01-05.md"))
+
+    output = assert_matches_full(vault)
+    assert output["run_metrics"]["total_km"] == 10.0
+
+
+def test_in_place_edit_of_open_month_matches_full(tmp_path):
+    vault = make_vault(tmp_path)
+    run_sync(vault)
+    write(vault, f"{OPEN_MONTH}/{OPEN_MONTH}-01.md", "- [x] Laufen (4km) (25:00min) #run\n")
+
+    report = {}
+    output = assert_matches_full(vault, report)
+    assert report["parsed"] == 1
+    assert output["run_metrics"]["total_km"] == 19.0
+
+
+def test_parallel_matches_serial(tmp_path, monkeypatch):
+    vault = make_vault(tmp_path)
+    serial = run_sync(vault, full=True)
+
+    # Der Testvault liegt unter PARALLEL_MIN_FILES; ohne Absenken liefe auch jobs=2 seriell
+    pools = []
+
+    class CountingExecutor(obsidian_rpg_sync_v5.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+    monkeypatch.setattr(obsidian_rpg_sync_v5, "PARALLEL_MIN_FILES", 1)
+    monkeypatch.setattr(obsidian_rpg_sync_v5, "ProcessPoolExecutor", CountingExecutor)
+
+    assert run_sync(vault, full=True, jobs=2) == serial
+    assert len(pools) == 1
+
+
+def test_invalid_journal_date_is_skipped(tmp_path):
+    # "2025-02-30" passt auf das Datumsmuster, ist aber kein Kalendertag
+    vault = make_vault(tmp_path)
+    with open(os.path.join(vault, "01_Core", "XP_Calculation.md"), "a", encoding="utf-8") as f:
+        f.write("| #lesson | Intellektuell | 1.0 | Ziel | @Kurs,10,2030-01-01 |\n")
+    os.makedirs(os.path.join(vault, "02_People", "Freunde"))
+    with open(os.path.join(vault, "02_People", "Freunde", "Anna.md"), "w", encoding="utf-8") as f:
+        f.write("Nähe: 5\n")
+    write(vault, "2025-02/2025-02-30.md",
+          "- [x] Aufräumen mit [[Anna]] (2p) #task\n- [x] Laufen (4km) (25:00min) #run\n- [x] Lektion #lesson\n")
+    run_sync(vault)
+    write(vault, f"{OPEN_MONTH}/{OPEN_MONTH}-32.md", "- [x] Laufen (2km) (12:00min) #run\n")
+
+    output = assert_matches_full(vault)
+    assert output["run_metrics"]["total_km"] == 24.0
+    assert output["goal_progress"][0]["current"] == 1.0
+
+
+def test_interrupted_sync_does_not_leave_stale_stores(tmp_path, monkeypatch):
+    vault = make_vault(tmp_path)
+    run_sync(vault)
+    write(vault, f"{OPEN_MONTH}/{OPEN_MONTH}-02.md", "- [x] Laufen (7km) (40:00min) #run\n")
+
+    def interrupt(*args, **kwargs):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(obsidian_rpg_sync_v5, "update_rollups", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        run_sync(vault)
+    monkeypatch.undo()
+
+    assert_matches_full(vault)
+    incremental = load_prefix(vault)
+    run_sync(vault, full=True)
+    assert incremental == load_prefix(vault)
+
+
+def test_as_of_resyncs_stale_prefix_and_prints_only_json(tmp_path, monkeypatch):
+    vault = make_vault(tmp_path)
+    run_sync(vault)
+    # Der Sync vor der Abfrage meldet den neuen SallyUp-Rekord ("[DEBUG] ...") auf stdout
+    write(vault, f"{OPEN_MONTH}/{OPEN_MONTH}-02.md",
+          "- [x] Laufen (7km) (40:00min) #run\n- [x] SallyUp (3:40 min) #sallyup\n")
+
+    # Abbruch vor den Präfix-Arrays: die Datei existiert, ist aber älter als die Journale
+    def interrupt(*args, **kwargs):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(obsidian_rpg_sync_v5, "update_rollups", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        run_sync(vault)
+    monkeypatch.undo()
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "obsidian_rpg_sync_v5.py")
+    result = subprocess.run([sys.executable, script, vault, "--as-of", TODAY.isoformat()],
+                            capture_output=True, text=True, check=True)
+    as_of = json.loads(result.stdout)
+    assert as_of["run_metrics"]["total_km"] == run_sync(vault, full=True)["run_metrics"]["total_km"] == 25.0
+
+
+def test_thoughts_and_skills_are_routed_like_v4(tmp_path):
+    # Der Vault-Durchlauf liefert wie v4 die Skill-Struktur, Gedanken je Kategorie und deren passive XP
+    vault = make_vault(tmp_path)
+    for rel in ("05_Thoughts/Insights/Idee.md", "05_Thoughts/Daily/Notiz.md", "03_Skills/Physisch/Laufen.md"):
+        path = os.path.join(vault, *rel.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("-\n")
+    output = run_sync(vault)
+    assert output["thought_activity"] == {"Deep_Thoughts": 0, "Insights": 1, "Daily": 1}
+    assert output["passive_xp"] == 11.0
+    assert output["skills"] == {"Physisch": ["Laufen"]}
+
+    os.makedirs(os.path.join(vault, "05_Thoughts", "Deep_Thoughts"))
+    with open(os.path.join(vault, "05_Thoughts", "Deep_Thoughts", "Frage.md"), "w", encoding="utf-8") as f:
+        f.write("-\n")
+    output = assert_matches_full(vault)
+    assert output["passive_xp"] == 26.0
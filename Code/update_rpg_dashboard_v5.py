@@ -1,263 +1,23 @@
 #!/usr/bin/env python3
-# obsidian_rpg_sync_v5.py
+# update_rpg_dashboard_v5.py
+# Ziel: Dashboard-Stufe der Pipeline - injiziert die bereits berechneten Daten ins HTML (kein eigener Vault-Scan)
 
-import os, json, datetime, re, sys
+import os, json, sys
 
-# --- KONSTANTEN & PFADE ---
-RULES_PATH = '01_Core/XP_Calculation.md'
-TODO_LIST_PATH = '01_Core/todo_list.md'
-JSON_CACHE_PATH = '08_System/life_rpg_data_v5.json' 
-JOURNAL_DIR_NAME = '07_Journal'
-BASE_XP_UNIT_MINUTES = 30 
-XP_POINTS_MAPPING = {"1p": 1.0, "3p": 3.0, "5p": 5.0, "8p": 8.0}
+from obsidian_rpg_sync_v5 import JSON_CACHE_PATH, update_dashboard_html
 
-# --- 1. REGELN LADEN ---
-def load_rpg_rules(vault_path):
-    rules_file = os.path.join(vault_path, RULES_PATH)
-    rules = {}
-    goal_rules = {}
-    categories = set(["Allgemein", "Finanziell", "Intellektuell", "Spirituell", "Physisch", "Sozial", "Sprachlich"])
-    if os.path.exists(rules_file):
-        with open(rules_file, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.startswith('|') and not any(x in line for x in [':---', 'Basis_XP']):
-                    parts = [p.strip() for p in line.split('|') if p.strip()]
-                    if len(parts) >= 3:
-                        tag, cat = parts[0].lower(), parts[1]
-                        try: xp = float(parts[2])
-                        except: xp = 0.5
-                        mode = parts[3] if len(parts) > 3 else "Zeit"
-                        metric = parts[4] if len(parts) > 4 else "-"
-                        rules[tag] = {
-                            "category": cat,
-                            "base_xp": xp,
-                            "mode": mode,
-                            "metric": metric
-                        }
-                        categories.add(cat)
-                        if len(parts) >= 5 and parts[3].lower() == "ziel":
-                            goal_spec = parts[4]
-                            if goal_spec.startswith("@") and "," in goal_spec:
-                                goal_parts = [p.strip() for p in goal_spec[1:].split(",")]
-                                if len(goal_parts) >= 2:
-                                    goal_name = goal_parts[0]
-                                    try:
-                                        goal_target = float(goal_parts[1])
-                                    except ValueError:
-                                        continue
-                                    end_date = None
-                                    if len(goal_parts) >= 3 and goal_parts[2]:
-                                        try:
-                                            end_date = datetime.date.fromisoformat(goal_parts[2]).isoformat()
-                                        except ValueError:
-                                            end_date = None
-                                    goal_rules[tag] = {
-                                        "name": goal_name.strip(),
-                                        "target": goal_target,
-                                        "end_date": end_date
-                                    }
-    return rules, list(categories), goal_rules
 
-# --- 2. PARSE-FUNKTIONEN (Robust) ---
-def parse_duration(task_text):
-    match_std = re.search(r'\((?:(?P<h>\d+)\s*h)?\s*(?P<m>\d+)\s*m(?:in)?\)', task_text, re.IGNORECASE)
-    if match_std:
-        return float(int(match_std.group('h') or 0) * 60 + int(match_std.group('m')))
-    match_mss = re.search(r'\((?P<m_ms>\d+):(?P<s_ms>\d{2})\s*min\)', task_text, re.IGNORECASE)
-    if match_mss:
-        return int(match_mss.group('m_ms')) + (int(match_mss.group('s_ms')) / 60.0)
-    return 0.0
+def update_dashboard(vault_path, output=None):
+    """ Aktualisiert das Dashboard mit `output`; ohne Übergabe wird der JSON-Cache der letzten Synchronisation gelesen. """
+    if output is None:
+        cache_file = os.path.join(vault_path, JSON_CACHE_PATH)
+        if not os.path.exists(cache_file):
+            print(f"[WARN] JSON-Cache nicht gefunden: {cache_file} (zuerst obsidian_rpg_sync_v5.py ausführen)")
+            return
+        with open(cache_file, "r", encoding="utf-8") as f:
+            output = json.load(f)
+    update_dashboard_html(vault_path, output)
 
-def parse_kilometers(task_text):
-    match = re.search(r'\((?P<km>\d+\.?\d*)\s*km\)', task_text, re.IGNORECASE)
-    return float(match.group('km')) if match else 0.0
-
-def parse_sallyup_time(task_text):
-    # Erkennt (3:40 min) oder (3:40min)
-    match = re.search(r'\((?P<m>\d+):(?P<s>\d{2})\s*min\)', task_text, re.IGNORECASE)
-    if match:
-        # Rückgabe als Float für den Vergleich (z.B. 3.66 Minuten)
-        return int(match.group('m')) + (int(match.group('s')) / 60.0)
-    return 0.0
-
-def parse_goal_reference(task_text, tag):
-    goal_match = re.search(rf'{re.escape(tag)}@([^#]+?)(?=\s#|$)', task_text, re.IGNORECASE)
-    if not goal_match:
-        return None, None
-    raw_name = goal_match.group(1).strip()
-    count_match = re.search(r'^(?P<name>.*?)[\(\[](?P<count>\d+)[\)\]]$', raw_name)
-    if count_match:
-        return count_match.group('name').strip(), int(count_match.group('count'))
-    count_match = re.search(r'^(?P<name>.*?)[,;]\s*(?P<count>\d+)$', raw_name)
-    if count_match:
-        return count_match.group('name').strip(), int(count_match.group('count'))
-    return raw_name, None
-
-def get_task_category(task_text, tag_rules):
-    for tag, rule in tag_rules.items():
-        if tag in task_text.lower():
-            return rule["category"]
-    return "Allgemein"
-
-# --- 3. KERN-SCAN (Full Scan Modus) ---
-def scan_vault(vault_path):
-    TAG_RULES, SKILL_CATEGORIES, GOAL_RULES = load_rpg_rules(vault_path)
-    
-    # Variablen für den Full-Scan (Reset bei jedem Start)
-    total_xp = 0.0
-    skill_xp = {cat: 0.0 for cat in SKILL_CATEGORIES}
-    run_total_km = 0.0
-    run_total_min = 0.0
-    sallyup_best_min = 0.0
-    goal_progress = {}
-    
-    stats = {
-        "open_tasks": {cat: [] for cat in SKILL_CATEGORIES},
-        "latest_daily_stats": {
-            "total_xp_today": 0.0, "tasks_today": 0, 
-            "minutes_today": 0.0, "daily_breakdown": {cat: 0.0 for cat in SKILL_CATEGORIES}
-        },
-        "latest_date": None
-    }
-
-    journal_dir = os.path.join(vault_path, JOURNAL_DIR_NAME)
-    all_files = []
-    for root, _, filenames in os.walk(journal_dir):
-        for f in filenames:
-            if f.endswith(".md") and re.match(r'\d{4}-\d{2}-\d{2}', f):
-                all_files.append((f[:-3], os.path.join(root, f)))
-    all_files.sort()
-
-    if all_files:
-        stats["latest_date"] = all_files[-1][0]
-        
-        for d_str, f_path in all_files:
-            is_latest = (d_str == stats["latest_date"])
-            with open(f_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            
-            # Abgeschlossene Tasks einlesen
-            completed_tasks = re.findall(r'^\s*- \[x\]\s*(.*)', content, re.MULTILINE)
-            
-            for task in completed_tasks:
-                xp_match = re.search(r'\((?P<p>\d+)p\)', task)
-                xp_val = XP_POINTS_MAPPING.get(f"{xp_match.group('p')}p", 0.0) if xp_match else 0.0
-                dur = parse_duration(task)
-                cat = get_task_category(task, TAG_RULES)
-                matched_rule = None
-                for tag, rule in TAG_RULES.items():
-                    if tag in task.lower():
-                        matched_rule = rule
-                        break
-
-                # Zeitbasierte XP
-                if xp_val == 0.0 and dur > 0:
-                    for tag, rule in TAG_RULES.items():
-                        if tag in task.lower():
-                            xp_val = (dur / BASE_XP_UNIT_MINUTES) * rule["base_xp"]
-                            break
-                if xp_val == 0.0 and matched_rule and matched_rule.get("mode") == "Ziel":
-                    xp_val = matched_rule["base_xp"]
-
-                # Kumulative Metriken
-                total_xp += xp_val
-                if cat in skill_xp: skill_xp[cat] += xp_val
-                
-                if "#run" in task.lower():
-                    run_total_km += parse_kilometers(task)
-                    run_total_min += dur
-                
-                
-                if "#sallyup" in task.lower():
-                    s_time = parse_sallyup_time(task)
-                    if s_time:
-                        if s_time > sallyup_best_min:
-                            sallyup_best_min = s_time
-                            print(f"[DEBUG] Neuer All-Time Rekord gefunden: {s_time} Min")
-
-                for tag, goal in GOAL_RULES.items():
-                    if tag in task.lower():
-                        match = re.search(r'@(?P<name>[\w\-]+)\((?P<count>\d+(?:\.\d+)?)\)', task, re.IGNORECASE)
-                        if match:
-                            count = float(match.group('count'))
-                            goal_name = match.group('name')
-                        else:
-                            count = 1.0
-                            goal_name = goal["name"]
-                        if goal_name not in goal_progress:
-                            goal_progress[goal_name] = {
-                                "title": goal_name,
-                                "current": 0.0,
-                                "target": goal["target"],
-                                "unit": "Lektionen",
-                                "end_date": goal.get("end_date")
-                            }
-                        goal_progress[goal_name]["current"] += count
-
-                # Heutige Statistik
-                if is_latest:
-                    stats["latest_daily_stats"]["tasks_today"] += 1
-                    stats["latest_daily_stats"]["total_xp_today"] += xp_val
-                    stats["latest_daily_stats"]["minutes_today"] += dur
-                    stats["latest_daily_stats"]["daily_breakdown"][cat] += xp_val
-                    stats["latest_daily_stats"].setdefault("completed_today", []).append(task)
-
-    # ToDo-Liste (Offene Quests)
-    todo_file = os.path.join(vault_path, TODO_LIST_PATH)
-    if os.path.exists(todo_file):
-        with open(todo_file, "r", encoding="utf-8") as f:
-            for t in re.findall(r'^\s*- \[ \]\s*(.*)', f.read(), re.MULTILINE):
-                cat = get_task_category(t, TAG_RULES)
-                stats["open_tasks"].setdefault(cat, []).append(t.strip())
-
-    if stats["latest_date"]:
-        try:
-            current_date = datetime.date.fromisoformat(stats["latest_date"])
-        except ValueError:
-            current_date = None
-        if current_date:
-            for goal in goal_progress.values():
-                target = goal.get("target")
-                if target is None:
-                    continue
-                remaining = max(target - goal.get("current", 0), 0)
-                goal["remaining"] = round(remaining, 2)
-                end_date = goal.get("end_date")
-                if end_date:
-                    try:
-                        end_dt = datetime.date.fromisoformat(end_date)
-                    except ValueError:
-                        end_dt = None
-                    if end_dt:
-                        days_remaining = max((end_dt - current_date).days, 0)
-                        goal["days_remaining"] = days_remaining
-                        if days_remaining > 0:
-                            goal["daily_workload"] = round(remaining / days_remaining, 2)
-                        else:
-                            goal["daily_workload"] = round(remaining, 2)
-
-    # Finales JSON
-    output = {
-        "total_xp": round(total_xp, 2),
-        "skill_xp_gained": {k: round(v, 2) for k, v in skill_xp.items()},
-        "run_metrics": {
-            "total_km": round(run_total_km, 2),
-            "total_minutes": round(run_total_min, 1)
-        },
-        "sallyup_best_time": sallyup_best_min,
-        "last_processed_date": stats["latest_date"],
-        "open_tasks": stats["open_tasks"],
-        "latest_daily_stats": stats["latest_daily_stats"],
-        "goal_progress": list(goal_progress.values())
-    }
-    
-    with open(os.path.join(vault_path, JSON_CACHE_PATH), "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2)
-    
-    print(f"--- Full Sync v5 ---")
-    print(f"Heute erledigt: {stats['latest_daily_stats']['tasks_today']} Aufgaben")
-    print(f"Laufen Gesamt: {output['run_metrics']['total_km']} km")
-    print(f"SallyUp Bestzeit: {output['sallyup_best_time']} min")
 
 if __name__ == "__main__":
-    scan_vault(sys.argv[1] if len(sys.argv) > 1 else ".")
+    update_dashboard(sys.argv[1] if len(sys.argv) > 1 else ".")
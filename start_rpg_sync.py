@@ -1,41 +1,53 @@
 import os
-import sys  # <--- DIESE ZEILE WAR VERMUTLICH FEHLEND!
+import sys
+import argparse
 
 # --- Konfiguration ---
-# Referenziert die V5-Skripte
-SYNC_SCRIPT = 'obsidian_rpg_sync_v5.py'
-UPDATE_SCRIPT = 'update_rpg_dashboard_v5.py'
+# Die V5-Stufen liegen im Code-Ordner des Vaults und werden direkt importiert (kein Kindprozess, ein Parse)
+CODE_DIR_NAME = 'Code'
+
+
+def run_pipeline(vault_path, full=False, jobs=1):
+    """ Führt Sync, JSON-Cache und Dashboard-Update in einem Prozess aus und gibt die Stufen-Zeiten aus. """
+    sys.path.insert(0, os.path.join(vault_path, CODE_DIR_NAME))
+    from obsidian_rpg_sync_v5 import run_sync, write_outputs, print_summary
+
+    report = {}
+    # 1. Daten-Synchronisation (einziger Parse des Vaults)
+    print("--- 1/2: Starte Daten-Synchronisation ---")
+    output = run_sync(vault_path, full, jobs, report)
+
+    # 2. JSON-Cache und Dashboard-Update mit denselben Daten aus dem Speicher (nur bei Änderung)
+    print("\n--- 2/2: Starte Dashboard-Update ---")
+    write_outputs(vault_path, output, report)
+
+    print_summary(output, report, full)
+    total = sum(report["timings"].values())
+    print("\n--- Stufen-Zeiten ---")
+    for stage, seconds in report["timings"].items():
+        print(f"{stage:<10} {seconds * 1000:8.1f} ms")
+    print(f"{'gesamt':<10} {total * 1000:8.1f} ms")
+    return output
+
 
 if __name__ == "__main__":
-    # Wenn sys.argv verwendet wird, muss sys importiert sein.
-    if len(sys.argv) < 2: 
+    parser = argparse.ArgumentParser(description="Life-RPG Sync-Pipeline v5")
+    parser.add_argument("vault_path", nargs="?")
+    parser.add_argument("--full", action="store_true", help="Manifest ignorieren und alle Journale neu parsen")
+    parser.add_argument("--jobs", type=int, default=1, help="Anzahl Prozesse für das Parsen (0 = alle CPU-Kerne)")
+    args = parser.parse_args()
+
+    if not args.vault_path:
         print("Fehler: Der Pfad zum Vault fehlt.")
-        sys.exit(1) # Auch sys.exit() erfordert den Import von sys
-        
-    vault_path = sys.argv[1]
-    code_path = os.path.join(vault_path, "Code")
-    
-    sync_path = os.path.join(code_path, SYNC_SCRIPT)
-    update_path = os.path.join(code_path, UPDATE_SCRIPT)
-    
-    if not os.path.exists(sync_path):
-        print(f"Fehler: Sync-Skript nicht gefunden unter {sync_path}")
         sys.exit(1)
-        
-    if not os.path.exists(update_path):
-        print(f"Fehler: Update-Skript nicht gefunden unter {update_path}")
+
+    code_path = os.path.join(args.vault_path, CODE_DIR_NAME)
+    if not os.path.exists(os.path.join(code_path, "obsidian_rpg_sync_v5.py")):
+        print(f"Fehler: Sync-Skript nicht gefunden unter {code_path}")
         sys.exit(1)
 
     try:
-        # 1. Daten-Synchronisation starten
-        print(f"--- 1/2: Starte Daten-Synchronisation ({SYNC_SCRIPT}) ---")
-        # Wichtig: Wir verwenden das Python-Executable, um das Skript im Child Process zu starten
-        os.system(f"python \"{sync_path}\" \"{vault_path}\"")
-        
-        # 2. Dashboard-Update starten
-        print(f"\n--- 2/2: Starte Dashboard-Update ({UPDATE_SCRIPT}) ---")
-        os.system(f"python \"{update_path}\" \"{vault_path}\"")
-        
+        run_pipeline(args.vault_path, args.full, args.jobs or os.cpu_count() or 1)
     except Exception as e:
         print(f"Ein kritischer Fehler ist aufgetreten: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)